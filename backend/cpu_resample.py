@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+# Per-slot aggregation used by the CPU charts: "mean", "max" or "p95"
+CPU_SLOT_AGGREGATION = os.getenv("CPU_SLOT_AGGREGATION", "mean")
+
+AGGREGATIONS = ("mean", "max", "p95")
+
+
+def to_arrays(rows, value_key="value"):
+    """Turn Zabbix history/trend rows into (clock, value) NumPy arrays."""
+    clocks = np.fromiter((int(row["clock"]) for row in rows), dtype=np.int64, count=len(rows))
+    values = np.fromiter((float(row[value_key]) for row in rows), dtype=np.float64, count=len(rows))
+    return clocks, values
+
+
+def trend_value_key(how=None):
+    """Trend column that matches the aggregation (hourly maxima for "max")."""
+    return "value_max" if (how or CPU_SLOT_AGGREGATION) == "max" else "value_avg"
+
+
+def _aggregate(groups, values, n_groups, how):
+    """Reduce values per group index; empty groups are 0."""
+    counts = np.bincount(groups, minlength=n_groups)
+    result = np.zeros(n_groups, dtype=np.float64)
+    filled = counts > 0
+
+    if how == "mean":
+        sums = np.bincount(groups, weights=values, minlength=n_groups)
+        result[filled] = sums[filled] / counts[filled]
+    elif how == "max":
+        maxima = np.full(n_groups, -np.inf)
+        np.maximum.at(maxima, groups, values)
+        result[filled] = maxima[filled]
+    elif how == "p95":
+        # Nearest-rank percentile: sort by (group, value) once, then pick the rank inside each group
+        order = np.lexsort((values, groups))
+        sorted_values = values[order]
+        starts = np.cumsum(counts) - counts
+        ranks = np.ceil(0.95 * counts).astype(np.int64) - 1
+        result[filled] = sorted_values[starts[filled] + ranks[filled]]
+    else:
+        raise ValueError(f"Unsupported CPU slot aggregation: {how}")
+
+    return result
+
+
+def resample_hosts(series, edges, how=None):
+    """
+    Align raw samples of many hosts onto the same slots in one pass.
+
+    series: {host_name: (clocks, values)}; edges: slot boundaries as unix
+    timestamps, slot i covering [edges[i], edges[i + 1]).
+    Returns {host_name: [int, ...]} with one value per slot.
+    """
+    how = how or CPU_SLOT_AGGREGATION
+    edges = np.asarray(edges, dtype=np.int64)
+    n_slots = len(edges) - 1
+    names = list(series.keys())
+    if not names or n_slots <= 0:
+        return {name: [] for name in names}
+
+    clocks = np.concatenate([series[name][0] for name in names])
+    values = np.concatenate([series[name][1] for name in names])
+    hosts = np.repeat(np.arange(len(names)), [len(series[name][0]) for name in names])
+
+    slots = np.searchsorted(edges, clocks, side="right") - 1
+    in_range = (slots >= 0) & (slots < n_slots)
+    groups = hosts[in_range] * n_slots + slots[in_range]
+
+    result = _aggregate(groups, values[in_range], len(names) * n_slots, how)
+    result = result.reshape(len(names), n_slots).astype(int)
+    return {name: result[i].tolist() for i, name in enumerate(names)}
@@ -1,141 +1,141 @@
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from typing import Optional
 import datetime
-import os
 
-from monthly_report_generate import build_monthy_report
-from weekly_report_generate import build_report_weekly
-from daily_report_generate import build_report_daily
+from functools import partial
+from report_engine import build_report
+from zabbix_queries import invalidate_metadata
+from report_cache import clear_window_cache
+from report_jobs import submit_report_job, get_job
+from report_catalog import allocate_report_path, cataloged_build
+from user_authen import get_optional_username
+from report_charts import CHART_BACKENDS
 # Define the request model for the POST API
 class DateRequest(BaseModel):
     date: str  # The date in the format YYYY-MM-DD
+    chart_backend: Optional[str] = None  # "raster" (PNG) or "vector"; defaults to REPORT_CHART_BACKEND
 
 # Create a new router
 router = APIRouter(prefix="/report", tags=["report-custom"])
 
-# Define the full absolute path to save the generated reports (custom_report/monthly inside the generated_reports folder)
-REPORTS_FOLDER_MONTHLY = os.path.join('generated_reports', 'custom_report', 'monthly')
-REPORTS_FOLDER_WEEKLY = os.path.join('generated_reports', 'custom_report', 'weekly')
-REPORTS_FOLDER_DAILY = os.path.join('generated_reports', 'custom_report', 'daily')
-# Ensure the reports folder exists (create if it doesn't)
-if not os.path.exists(REPORTS_FOLDER_MONTHLY):
-    print(f"Creating directory: {REPORTS_FOLDER_MONTHLY}")  # Debugging print statement
-    os.makedirs(REPORTS_FOLDER_MONTHLY)
-
-def get_unique_filename(base_path: str):
-    """Generate a unique filename by appending a version number if needed."""
-    version = 1
-    file_path = base_path
-    while os.path.exists(file_path):  # Check if the file already exists
-        version += 1  # Increment version number
-        file_path = f"{base_path.rsplit('.', 1)[0]}-{version}.pdf"  # Append version number to filename
-    return file_path
+def report_end(date_object):
+    """End of the requested day: the report covers the period that contains `date`."""
+    return date_object + datetime.timedelta(days=1)  # Clipped to now for today's date; future dates are rejected
 
 @router.post("/custom-monthly-report")
-async def custom_monthly_report(data: DateRequest):
+async def custom_monthly_report(data: DateRequest, username: Optional[str] = Depends(get_optional_username)):
     # Validate and format the date from the request
     try:
         # Try to parse the date in case it's incorrect
         date_object = datetime.datetime.strptime(data.date, "%Y-%m-%d")
     except ValueError:
         return {"error": "Invalid date format, expected YYYY-MM-DD."}
+    if date_object.date() > datetime.date.today():
+        return {"error": "Date cannot be in the future."}
+    if data.chart_backend and data.chart_backend not in CHART_BACKENDS:
+        return {"error": f"Invalid chart backend, expected one of: {', '.join(CHART_BACKENDS)}."}
     
     # Generate the custom report name
     custom_report_name = f"Custom-{data.date}-monthly-Monitoring_Report.pdf"
     
     
-    report_path = os.path.join(REPORTS_FOLDER_MONTHLY, custom_report_name)
-    
-    # Ensure the filename is unique (handle versioning if the file already exists)
-    unique_report_path = get_unique_filename(report_path)
+    # Claim a unique name in the report catalog (handles versioning if the name is taken)
+    report_id, unique_report_path = await run_in_threadpool(
+        allocate_report_path, "custom", "monthly", custom_report_name, username)
     
     # Debugging: Print the path to ensure it's correct
     print(f"Saving report to: {unique_report_path}")  # This will show the exact location of where the file is being saved
 
-    # Call the build_report function with the full path for saving the report
-    build_monthy_report(unique_report_path)
+    # Build in the report worker pool so the event loop stays free; poll /report/jobs/{job_id}
+    job_id = submit_report_job(report_id, "monthly", cataloged_build(report_id, partial(build_report, "monthly")), unique_report_path,
+                               end=report_end(date_object), chart_backend=data.chart_backend)
     
-    return {"message": f"Custom monthly report generated: {unique_report_path}"}
-
-# Ensure the reports folder exists (create if it doesn't)
-if not os.path.exists(REPORTS_FOLDER_WEEKLY):
-    print(f"Creating directory: {REPORTS_FOLDER_WEEKLY}")  # Debugging print statement
-    os.makedirs(REPORTS_FOLDER_WEEKLY)
-
-def get_unique_filename(base_path: str):
-    """Generate a unique filename by appending a version number if needed."""
-    version = 1
-    file_path = base_path
-    while os.path.exists(file_path):  # Check if the file already exists
-        version += 1  # Increment version number
-        file_path = f"{base_path.rsplit('.', 1)[0]}-{version}.pdf"  # Append version number to filename
-    return file_path
+    return {"message": f"Custom monthly report queued: {unique_report_path}", "job_id": job_id, "status": "building"}
 
 @router.post("/custom-weekly-report")
-async def custom_weekly_report(data: DateRequest):
+async def custom_weekly_report(data: DateRequest, username: Optional[str] = Depends(get_optional_username)):
     # Validate and format the date from the request
     try:
         # Try to parse the date in case it's incorrect
         date_object = datetime.datetime.strptime(data.date, "%Y-%m-%d")
     except ValueError:
         return {"error": "Invalid date format, expected YYYY-MM-DD."}
+    if date_object.date() > datetime.date.today():
+        return {"error": "Date cannot be in the future."}
+    if data.chart_backend and data.chart_backend not in CHART_BACKENDS:
+        return {"error": f"Invalid chart backend, expected one of: {', '.join(CHART_BACKENDS)}."}
     
     # Generate the custom report name
     custom_report_name = f"Custom-{data.date}-Weekly-Monitoring_Report.pdf"
     
     
-    report_path = os.path.join(REPORTS_FOLDER_WEEKLY, custom_report_name)
-    
-    # Ensure the filename is unique (handle versioning if the file already exists)
-    unique_report_path = get_unique_filename(report_path)
+    # Claim a unique name in the report catalog (handles versioning if the name is taken)
+    report_id, unique_report_path = await run_in_threadpool(
+        allocate_report_path, "custom", "weekly", custom_report_name, username)
     
     # Debugging: Print the path to ensure it's correct
     print(f"Saving report to: {unique_report_path}")  # This will show the exact location of where the file is being saved
 
-    # Call the build_report function with the full path for saving the report
-    build_report_weekly(unique_report_path)
+    # Build in the report worker pool so the event loop stays free; poll /report/jobs/{job_id}
+    job_id = submit_report_job(report_id, "weekly", cataloged_build(report_id, partial(build_report, "weekly")), unique_report_path,
+                               end=report_end(date_object), chart_backend=data.chart_backend)
     
-    return {"message": f"Custom weekly report generated: {unique_report_path}"}
-
+    return {"message": f"Custom weekly report queued: {unique_report_path}", "job_id": job_id, "status": "building"}
 
 
-# Ensure the reports folder exists (create if it doesn't)
-if not os.path.exists(REPORTS_FOLDER_DAILY):
-    print(f"Creating directory: {REPORTS_FOLDER_DAILY}")  # Debugging print statement
-    os.makedirs(REPORTS_FOLDER_DAILY)
-
-def get_unique_filename(base_path: str):
-    """Generate a unique filename by appending a version number if needed."""
-    version = 1
-    file_path = base_path
-    while os.path.exists(file_path):  # Check if the file already exists
-        version += 1  # Increment version number
-        file_path = f"{base_path.rsplit('.', 1)[0]}-{version}.pdf"  # Append version number to filename
-    return file_path
 
 @router.post("/custom-daily-report")
-async def custom_daily_report(data: DateRequest):
+async def custom_daily_report(data: DateRequest, username: Optional[str] = Depends(get_optional_username)):
     # Validate and format the date from the request
     try:
         # Try to parse the date in case it's incorrect
         date_object = datetime.datetime.strptime(data.date, "%Y-%m-%d")
     except ValueError:
         return {"error": "Invalid date format, expected YYYY-MM-DD."}
+    if date_object.date() > datetime.date.today():
+        return {"error": "Date cannot be in the future."}
+    if data.chart_backend and data.chart_backend not in CHART_BACKENDS:
+        return {"error": f"Invalid chart backend, expected one of: {', '.join(CHART_BACKENDS)}."}
     
     # Generate the custom report name
     custom_report_name = f"Custom-{data.date}-Daily-Monitoring_Report.pdf"
     
     # Define the full path to save the report in the 'daily' folder
-    report_path = os.path.join(REPORTS_FOLDER_DAILY, custom_report_name)
-    
-    # Ensure the filename is unique (handle versioning if the file already exists)
-    unique_report_path = get_unique_filename(report_path)
+    # Claim a unique name in the report catalog (handles versioning if the name is taken)
+    report_id, unique_report_path = await run_in_threadpool(
+        allocate_report_path, "custom", "daily", custom_report_name, username)
     
     # Debugging: Print the path to ensure it's correct
     print(f"Saving report to: {unique_report_path}")  # This will show the exact location of where the file is being saved
 
-    # Call the build_report function with the full path for saving the report
-    build_report_daily(unique_report_path)
+    # Build in the report worker pool so the event loop stays free; poll /report/jobs/{job_id}
+    job_id = submit_report_job(report_id, "daily", cataloged_build(report_id, partial(build_report, "daily")), unique_report_path,
+                               end=report_end(date_object), chart_backend=data.chart_backend)
     
-    return {"message": f"Custom daily report generated: {unique_report_path}"}
\ No newline at end of file
+    return {"message": f"Custom daily report queued: {unique_report_path}", "job_id": job_id, "status": "building"}
+
+
+@router.get("/jobs/{job_id}")
+def get_report_job(job_id: int):
+    """Status and progress of a report build; the job ID is the report catalog ID."""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+@router.post("/zabbix-metadata/invalidate")
+async def invalidate_zabbix_metadata():
+    """Drop cached Zabbix host groups, hosts and CPU itemids (e.g. after adding hosts)."""
+    invalidate_metadata()
+    return {"message": "Zabbix metadata cache invalidated"}
+
+
+@router.post("/source-cache/clear")
+async def clear_source_cache():
+    """Drop cached source results of closed windows (memory and report_cache/ on disk)."""
+    clear_window_cache()
+    return {"message": "Report source cache cleared"}
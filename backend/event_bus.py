@@ -0,0 +1,97 @@
+import os
+import threading
+from collections import deque
+
+# Messages published within this many seconds go out as one WebSocket frame
+EVENT_BUS_BATCH_WINDOW = float(os.getenv("EVENT_BUS_BATCH_WINDOW", "0.05"))
+# Messages kept while no event loop is bound (oldest dropped first)
+EVENT_BUS_MAX_PENDING = int(os.getenv("EVENT_BUS_MAX_PENDING", "1000"))
+
+
+class EventBus:
+    """Publish notifications from any thread; deliver them on the server's event loop.
+
+    publish() only appends to a deque and, for the first message of a batch,
+    schedules a flush with call_soon_threadsafe. The flush runs on the loop,
+    joins the batch into one frame and hands it to the WebSocket manager.
+
+    With a relay set (see event_relay), publish() hands the message to the
+    relay instead, which brings it back through publish_local() in every
+    API process, so clients of all workers get it.
+    """
+
+    def __init__(self):
+        self._pending = deque(maxlen=EVENT_BUS_MAX_PENDING)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._flush_scheduled = False
+        self._subscribers = []
+        self._relay = None
+
+    def subscribe(self, deliver):
+        """Register a callable taking one frame (str); called on the event loop."""
+        self._subscribers.append(deliver)
+
+    def bind(self, loop):
+        """Attach the running event loop (at app startup) and deliver anything published before."""
+        with self._lock:
+            self._loop = loop
+        self._schedule()
+
+    def set_relay(self, relay):
+        """Send published messages through `relay(message)` (None: deliver in this process only)."""
+        self._relay = relay
+
+    def publish(self, message: str):
+        """Thread-safe; safe from APScheduler jobs and report workers.
+
+        Without a relay it never blocks; with one it makes one short database
+        round trip, so do not call it on the event loop.
+        """
+        relay = self._relay
+        if relay is not None:
+            try:
+                relay(message)
+                return
+            except Exception as e:
+                print(f"⚠️ Event relay failed, notifying this process only: {e}")
+        self.publish_local(message)
+
+    def publish_local(self, message: str):
+        """Deliver to this process's subscribers only; thread-safe and non-blocking."""
+        with self._lock:
+            self._pending.append(message)
+        self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            if self._loop is None or self._flush_scheduled or not self._pending:
+                return
+            self._flush_scheduled = True
+            loop = self._loop
+        try:
+            loop.call_soon_threadsafe(self._start_flush)
+        except RuntimeError:
+            # Loop already closed (shutdown): keep the messages pending
+            with self._lock:
+                self._flush_scheduled = False
+
+    def _start_flush(self):
+        self._loop.call_later(EVENT_BUS_BATCH_WINDOW, self._flush)
+
+    def _flush(self):
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._flush_scheduled = False
+        if not batch:
+            return
+        frame = "\n".join(batch)  # One frame per batch, one message per line
+        for deliver in self._subscribers:
+            try:
+                deliver(frame)
+            except Exception as e:
+                print(f"⚠️ Event bus subscriber failed: {e}")
+
+
+event_bus = EventBus()
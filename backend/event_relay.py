@@ -0,0 +1,79 @@
+import os
+import select
+import threading
+
+from sqlalchemy import text
+
+from database import engine
+from event_bus import event_bus
+
+# PostgreSQL channel that carries notifications between API processes
+EVENT_RELAY_CHANNEL = os.getenv("EVENT_RELAY_CHANNEL", "report_events")
+# Seconds to wait before reconnecting after the LISTEN connection drops
+EVENT_RELAY_RETRY_INTERVAL = float(os.getenv("EVENT_RELAY_RETRY_INTERVAL", "5"))
+# NOTIFY payloads must stay below 8000 bytes
+EVENT_RELAY_MAX_PAYLOAD = 7900
+
+_stop = threading.Event()
+_thread = None
+
+
+def _notify(message):
+    """Send a message to every listening API process (including this one)."""
+    payload = message.encode()[:EVENT_RELAY_MAX_PAYLOAD].decode(errors="ignore")
+    # Delivered to the listeners when the transaction commits
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_notify(:channel, :payload)"),
+                           {"channel": EVENT_RELAY_CHANNEL, "payload": payload})
+
+
+def _listen():
+    """Feed the channel's notifications to this process's event bus, reconnecting as needed."""
+    while not _stop.is_set():
+        connection = None
+        try:
+            connection = engine.raw_connection()
+            listener = connection.driver_connection  # psycopg2 (requirements.txt): poll() and notifies
+            listener.autocommit = True  # LISTEN takes effect right away, no open transaction
+            with listener.cursor() as cursor:
+                cursor.execute(f'LISTEN "{EVENT_RELAY_CHANNEL}"')
+            print(f"✅ Event relay listening on '{EVENT_RELAY_CHANNEL}'")
+            while not _stop.is_set():
+                # Wake up now and then to notice stop_event_relay()
+                if select.select([listener], [], [], 5) == ([], [], []):
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    event_bus.publish_local(listener.notifies.pop(0).payload)
+        except Exception as e:
+            print(f"⚠️ Event relay connection lost: {e}")
+        finally:
+            if connection is not None:
+                # Still LISTENing and in autocommit: never hand it back to the pool
+                connection.invalidate()
+                connection.close()
+        _stop.wait(EVENT_RELAY_RETRY_INTERVAL)
+
+
+def start_event_relay():
+    """Relay event bus messages through PostgreSQL LISTEN/NOTIFY.
+
+    Scheduled jobs run only in the leader process and report builds in the
+    worker that queued them; the relay lets every API worker's WebSocket
+    clients see their notifications. Other databases (the SQLite tests)
+    keep the bus process-local.
+    """
+    global _thread
+    if engine.dialect.name != "postgresql" or _thread is not None:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_listen, name="event-relay", daemon=True)
+    _thread.start()
+    event_bus.set_relay(_notify)
+
+
+def stop_event_relay():
+    global _thread
+    event_bus.set_relay(None)
+    _stop.set()
+    _thread = None
@@ -1,110 +1,150 @@
 import os
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import FileResponse, Response
 from fastapi import FastAPI, HTTPException
+from sqlalchemy.orm import Session
+
+from database import get_db
+from report_catalog import (
+    REPORTS_ROOT, REPORT_TYPES, SORT_FIELDS,
+    report_folder, list_reports, file_names, find_report, mark_deleted,
+)
 
 router = APIRouter(tags=["File_manager-Custom"])
 
 # Define the directories for daily, weekly, and monthly reports
 REPORTS_BASE_PATH = "generated_reports/custom_report"
 REPORTS_BASE_PATH_SCHEDULE = "generated_reports/schedule_report"
-def list_files_in_directory(directory):
-    """Utility function to list files in a given directory."""
-    files = []
-    if os.path.exists(directory):
-        files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-    return files
+# Cache-Control for report files (their content never changes)
+REPORT_CACHE_CONTROL = os.getenv("REPORT_CACHE_CONTROL", "private, max-age=31536000, immutable")
+# nginx internal location (e.g. "/protected_reports/") to hand file transfers to; empty = serve from the API
+REPORT_ACCEL_REDIRECT = os.getenv("REPORT_ACCEL_REDIRECT", "")
 
 @router.get("/custom/files")
-async def get_files():
-    """Endpoint to return the files categorized by daily, weekly, and monthly."""
-    daily_files = list_files_in_directory(os.path.join(REPORTS_BASE_PATH, "daily"))
-    weekly_files = list_files_in_directory(os.path.join(REPORTS_BASE_PATH, "weekly"))
-    monthly_files = list_files_in_directory(os.path.join(REPORTS_BASE_PATH, "monthly"))
-
-    return {
-        "daily": daily_files,
-        "weekly": weekly_files,
-        "monthly": monthly_files
-    }
+def get_files(db: Session = Depends(get_db)):
+    """Endpoint to return the files categorized by daily, weekly, and monthly (unpaginated; the UI uses /reports)."""
+    return file_names(db, "custom")
 
 @router.get("/schedule/files")
-async def get_files_schedule():
-    """Endpoint to return the files categorized by daily, weekly, and monthly."""
-    daily_files = list_files_in_directory(os.path.join(REPORTS_BASE_PATH_SCHEDULE, "daily"))
-    weekly_files = list_files_in_directory(os.path.join(REPORTS_BASE_PATH_SCHEDULE, "weekly"))
-    monthly_files = list_files_in_directory(os.path.join(REPORTS_BASE_PATH_SCHEDULE, "monthly"))
-
-    return {
-        "daily": daily_files,
-        "weekly": weekly_files,
-        "monthly": monthly_files
-    }
-
-@router.get("/custom/files/{file_type}/{file_name}/preview")
-async def preview_file(file_type: str, file_name: str):
-    file_path = os.path.join(REPORTS_BASE_PATH, file_type, file_name)
-    print(file_path)
-    if not os.path.exists(file_path):
+def get_files_schedule(db: Session = Depends(get_db)):
+    """Endpoint to return the files categorized by daily, weekly, and monthly (unpaginated; the UI uses /reports)."""
+    return file_names(db, "schedule")
+
+@router.get("/reports")
+def get_reports(
+    source: Optional[str] = None,
+    report_type: Optional[str] = None,
+    status: Optional[str] = None,
+    created_by: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    page: int = 1,
+    page_size: int = 50,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Paginated report catalog with filters; served from the index, no directory scans."""
+    if sort not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort field, expected one of: {', '.join(SORT_FIELDS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid order, expected 'asc' or 'desc'")
+    return list_reports(db, source, report_type, status, created_by, date_from, date_to, sort, order, page, page_size,
+                        search)
+
+def _etag(entry, stat_result):
+    """Strong validator: the catalog's SHA-256, or size + mtime for uncataloged files."""
+    if entry is not None and entry.checksum:
+        return f'"{entry.checksum}"'
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def serve_report(request: Request, db: Session, source: str, file_type: str, file_name: str, download: bool = False):
+    """Send a generated PDF with caching headers.
+
+    Report files never change once built and their names are never reused, so
+    they are cached as immutable; If-None-Match gets a 304 and Range requests
+    are answered by FileResponse. With REPORT_ACCEL_REDIRECT set, nginx sends
+    the bytes and the API worker only checks the catalog.
+    """
+    if file_type not in REPORT_TYPES or os.path.basename(file_name) != file_name:
+        raise HTTPException(status_code=404, detail="File not found")
+    file_path = os.path.join(report_folder(source, file_type), file_name)
+    entry = find_report(db, source, file_type, file_name)
+    if (entry is not None and entry.status != "ready") or not os.path.isfile(file_path):
         raise HTTPException(status_code=404, detail="File not found")
 
-    # Send the PDF file as a response with appropriate content type
-    return FileResponse(file_path, media_type="application/pdf")
+    headers = {"ETag": _etag(entry, os.stat(file_path)), "Cache-Control": REPORT_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if download:
+        # Send the file with the Content-Disposition header to prompt download
+        headers["Content-Disposition"] = f"attachment; filename={file_name}"
+
+    if REPORT_ACCEL_REDIRECT:
+        # nginx serves the file from its internal location (ranges included)
+        relative_path = os.path.relpath(file_path, REPORTS_ROOT).replace(os.sep, "/")
+        headers["X-Accel-Redirect"] = REPORT_ACCEL_REDIRECT.rstrip("/") + "/" + quote(relative_path)
+        return Response(media_type="application/pdf", headers=headers)
+    return FileResponse(file_path, media_type="application/pdf", headers=headers)
 
-@router.get("/schedule/files/{file_type}/{file_name}/preview")
-async def preview_file_schedule(file_type: str, file_name: str):
-    file_path = os.path.join(REPORTS_BASE_PATH_SCHEDULE, file_type, file_name)
-    print(file_path)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
+@router.get("/custom/files/{file_type}/{file_name}/preview")
+def preview_file(file_type: str, file_name: str, request: Request, db: Session = Depends(get_db)):
+    return serve_report(request, db, "custom", file_type, file_name)
 
-    # Send the PDF file as a response with appropriate content type
-    return FileResponse(file_path, media_type="application/pdf")
+@router.get("/schedule/files/{file_type}/{file_name}/preview")
+def preview_file_schedule(file_type: str, file_name: str, request: Request, db: Session = Depends(get_db)):
+    return serve_report(request, db, "schedule", file_type, file_name)
 
 @router.get("/custom/files/{file_type}/{file_name}/download")
-async def download_file(file_type: str, file_name: str):
-    file_path = os.path.join(REPORTS_BASE_PATH, file_type, file_name)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-
-    # Send the file as a response with the Content-Disposition header to prompt download
-    return FileResponse(file_path, media_type="application/pdf", headers={
-        "Content-Disposition": f"attachment; filename={file_name}"
-    })
+def download_file(file_type: str, file_name: str, request: Request, db: Session = Depends(get_db)):
+    return serve_report(request, db, "custom", file_type, file_name, download=True)
 
 @router.get("/schedule/files/{file_type}/{file_name}/download")
-async def download_file_schedule(file_type: str, file_name: str):
-    file_path = os.path.join(REPORTS_BASE_PATH_SCHEDULE, file_type, file_name)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
-
-    # Send the file as a response with the Content-Disposition header to prompt download
-    return FileResponse(file_path, media_type="application/pdf", headers={
-        "Content-Disposition": f"attachment; filename={file_name}"
-    })
+def download_file_schedule(file_type: str, file_name: str, request: Request, db: Session = Depends(get_db)):
+    return serve_report(request, db, "schedule", file_type, file_name, download=True)
 
 @router.delete("/custom/files/{file_type}/{file_name}")
-async def delete_file(file_type: str, file_name: str):
+def delete_file(file_type: str, file_name: str, db: Session = Depends(get_db)):
     file_path = os.path.join(REPORTS_BASE_PATH, file_type, file_name)
+    entry = find_report(db, "custom", file_type, file_name)
     if not os.path.exists(file_path):
+        if entry is not None:
+            mark_deleted(db, entry)  # Stale catalog entry
         raise HTTPException(status_code=404, detail="File not found")
 
     # Attempt to delete the file
     try:
         os.remove(file_path)
+        if entry is not None:
+            mark_deleted(db, entry)
         return {"message": f"File '{file_name}' has been deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
     
 @router.delete("/schedule/files/{file_type}/{file_name}")
-async def delete_file(file_type: str, file_name: str):
+def delete_file_schedule(file_type: str, file_name: str, db: Session = Depends(get_db)):
     file_path = os.path.join(REPORTS_BASE_PATH_SCHEDULE, file_type, file_name)
+    entry = find_report(db, "schedule", file_type, file_name)
     if not os.path.exists(file_path):
+        if entry is not None:
+            mark_deleted(db, entry)  # Stale catalog entry
         raise HTTPException(status_code=404, detail="File not found")
 
     # Attempt to delete the file
     try:
         os.remove(file_path)
+        if entry is not None:
+            mark_deleted(db, entry)
         return {"message": f"File '{file_name}' has been deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
\ No newline at end of file
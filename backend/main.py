@@ -1,19 +1,25 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import asyncio
+import threading
 from dotenv import load_dotenv
 
 
-from websocket_router import websocket_router  # Import your websocket router
+from websocket_router import websocket_router, ws_manager  # Import your websocket router
+from event_bus import event_bus
+from event_relay import start_event_relay, stop_event_relay
 # Import routers
 from file_manager import router as file_manager_router
 from alert_gateway import router as alert_router
 from customReportAPI import router as custom_report_router
-from scheduleReportAPI import router as schedule_report_router
+from scheduleReportAPI import router as schedule_report_router, start_scheduler, stop_scheduler
 from database_manager_API import router as db_router
 from user_authen import router as auth_router
 from maintenance_router import router as maintenance_router
 from init_db import init_db
+from zabbix_queries import warm_up_metadata
+from report_catalog import sync_catalog
 # Load environment variables
 load_dotenv()
 
@@ -33,6 +39,35 @@ app.add_middleware(
 )
 init_db()
 
+@app.on_event("startup")
+async def start_event_bus():
+    # Scheduler jobs and report workers publish from their own threads; deliver on this loop
+    event_bus.subscribe(ws_manager.broadcast)
+    event_bus.bind(asyncio.get_running_loop())
+    # Fan notifications out to every API worker (the scheduler runs in one of them)
+    start_event_relay()
+
+@app.on_event("startup")
+def warm_up_zabbix_metadata():
+    # Optionally pre-load Zabbix metadata in the background so startup never waits on Zabbix
+    if os.getenv("ZABBIX_METADATA_WARMUP", "false").lower() == "true":
+        threading.Thread(target=warm_up_metadata, daemon=True).start()
+
+@app.on_event("startup")
+def sync_report_catalog():
+    # Catalog reports generated before the catalog existed (one scan, in the background)
+    threading.Thread(target=sync_catalog, daemon=True).start()
+
+@app.on_event("startup")
+def start_report_scheduler():
+    # Every process joins the leader election; only the lock holder runs scheduled jobs
+    start_scheduler()
+
+@app.on_event("shutdown")
+def stop_report_scheduler():
+    stop_scheduler()
+    stop_event_relay()
+
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to FastAPI with WebSocket"}
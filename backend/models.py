@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Float, Index
 from sqlalchemy.sql import func
 from database import Base
 
@@ -20,3 +20,76 @@ class Maintenance(Base):
     changedBy = Column(String(50), nullable=False)
     notes = Column(Text)
     status = Column(String(50), default="pending")
+
+class ReportFile(Base):
+    __tablename__ = "report_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(20), nullable=False)  # "custom" or "schedule"
+    report_type = Column(String(20), nullable=False)  # "daily", "weekly" or "monthly"
+    file_name = Column(String(255), nullable=False)
+    path = Column(String(500), unique=True, nullable=False)  # Unique: allocating a name is one INSERT
+    status = Column(String(20), default="building")  # building / ready / failed
+    progress = Column(Integer, default=0)  # Percent done while building, served by /report/jobs/{id}
+    stage = Column(String(100), default="Queued")
+    error = Column(Text)  # Why the build failed
+    window_start = Column(DateTime)
+    window_end = Column(DateTime)
+    size_bytes = Column(BigInteger)
+    checksum = Column(String(64))  # SHA-256 of the PDF
+    duration_seconds = Column(Float)  # Generation time
+    created_by = Column(String(50))
+    created_at = Column(DateTime(timezone=True), default=func.now())
+
+    __table_args__ = (Index("ix_report_files_listing", "source", "report_type", "created_at"),)
+
+# ---------------------------------------------------------------------------
+# Hourly rollups of the report sources (filled by rollup_ingest.py).
+# `hour` is the local start of the hour; weekly/monthly reports sum these rows
+# instead of re-reading raw Zabbix/OpenSearch data.
+# ---------------------------------------------------------------------------
+
+class ProblemHourly(Base):
+    __tablename__ = "rollup_problem_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    group_name = Column(String(100), primary_key=True)
+    host = Column(String(255), primary_key=True)
+    problem = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    last_clock = Column(Integer, nullable=False)  # Unix time of the last event in the hour
+
+    __table_args__ = (Index("ix_rollup_problem_hourly_group_hour", "group_name", "hour"),)
+
+class DowntimeHourly(Base):
+    __tablename__ = "rollup_downtime_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    monitor = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class AlertHourly(Base):
+    __tablename__ = "rollup_alert_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    signature_id = Column(String(50), primary_key=True)
+    severity = Column(Integer, primary_key=True)
+    signature = Column(Text)
+    count = Column(Integer, nullable=False, default=0)
+    last_hit = Column(String(40))  # ISO timestamp as returned by OpenSearch
+
+class CpuHourly(Base):
+    __tablename__ = "rollup_cpu_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    host = Column(String(255), primary_key=True)
+    value_min = Column(Float)
+    value_avg = Column(Float)
+    value_max = Column(Float)
+
+class RollupState(Base):
+    __tablename__ = "rollup_state"
+
+    source = Column(String(50), primary_key=True)
+    rolled_from = Column(DateTime, nullable=False)  # First hour ingested (backfill start)
+    rolled_until = Column(DateTime, nullable=False)  # Rows are complete before this hour
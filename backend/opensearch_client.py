@@ -0,0 +1,51 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Assuming your .env is in the project root
+dotenv_path = Path(__file__).resolve().parent / '.env'
+load_dotenv(dotenv_path)
+
+OPENSEARCH_POOL_SIZE = int(os.getenv("OPENSEARCH_POOL_SIZE", "10"))
+OPENSEARCH_TIMEOUT = float(os.getenv("OPENSEARCH_TIMEOUT", "60"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared keep-alive OpenSearch session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                adapter = HTTPAdapter(pool_connections=OPENSEARCH_POOL_SIZE, pool_maxsize=OPENSEARCH_POOL_SIZE)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+
+def opensearch_search(base_url, index, query, auth=None, verify=True):
+    """Run a _search request and return the decoded body.
+
+    Raises on HTTP errors and on partial results (timed out or failed shards),
+    which would otherwise look like complete, low counts.
+    """
+    response = get_session().post(
+        f"{base_url}/{index}/_search",
+        json=query,
+        auth=auth,
+        verify=verify,
+        timeout=OPENSEARCH_TIMEOUT
+    )
+    response.raise_for_status()
+    data = response.json()
+    if data.get("timed_out") or data.get("_shards", {}).get("failed"):
+        raise RuntimeError(f"OpenSearch search on '{index}' returned partial results")
+    return data
@@ -0,0 +1,187 @@
+import os
+from dateutil import parser
+from dotenv import load_dotenv
+from pathlib import Path
+dotenv_path = Path(__file__).resolve().parents[1] / '.env'
+load_dotenv(dotenv_path)
+
+import report_rollups
+from report_cache import memoize_per_build, memoize_closed_window, split_live_window
+from opensearch_client import opensearch_search
+
+OPENSEARCH_URL = os.getenv("OPENSEARCH_URL")
+OPENSEARCH_SURICATA_INDEX = os.getenv("OPENSEARCH_SURICATA_INDEX")
+
+# Number of distinct signatures returned by the terms aggregation
+SURICATA_SIGNATURE_BUCKETS = int(os.getenv("SURICATA_SIGNATURE_BUCKETS", "500"))
+# Number of distinct alert.severity values returned when rolling alerts up
+SURICATA_SEVERITY_BUCKETS = int(os.getenv("SURICATA_SEVERITY_BUCKETS", "20"))
+
+
+def _merge_alerts(head, tail, slot):
+    alerts = {alert[1]: list(alert) for alert in head}
+    for signature, sig_id, count, last_hit, slots in tail:
+        if sig_id in alerts:
+            merged = alerts[sig_id]
+            merged[2] += count
+            merged[3] = max(merged[3], last_hit)  # ISO timestamps sort chronologically
+            merged[4] = [a + b for a, b in zip(merged[4], slots)]
+        else:
+            alerts[sig_id] = [signature, sig_id, count, last_hit, slots]
+    return [tuple(alert) for alert in alerts.values()]
+
+
+def _signature_aggs(window):
+    """Per signature_id: the signature name, the last hit and the count (and last hit) per window slot."""
+    return {
+        "signatures": {
+            "terms": {"field": "alert.signature_id", "size": SURICATA_SIGNATURE_BUCKETS},
+            "aggs": {
+                "signature": {"top_hits": {"size": 1, "_source": ["alert.signature"]}},
+                "last_hit": {"max": {"field": "@timestamp"}},
+                "per_slot": {
+                    "date_range": {
+                        "field": "@timestamp",
+                        "format": "epoch_millis",
+                        "ranges": [
+                            {"from": stamp * 1000, "to": next_stamp * 1000}
+                            for stamp, next_stamp in zip(window.edge_stamps, window.edge_stamps[1:])
+                        ],
+                    },
+                    "aggs": {"last_hit": {"max": {"field": "@timestamp"}}},
+                }
+            }
+        }
+    }
+
+
+def _signature_rows(aggregations, slot_hits):
+    alerts = []
+    for bucket in aggregations.get("signatures", {}).get("buckets", []):
+        hits = bucket["signature"]["hits"]["hits"]
+        alert_info = hits[0].get("_source", {}).get("alert", {}) if hits else {}
+
+        signature = alert_info.get("signature", "Unknown Threat")
+        signature_id = str(bucket["key"])
+        last_hit = bucket["last_hit"].get("value_as_string", "")
+        if slot_hits:
+            slots = [(slot["doc_count"], slot["last_hit"].get("value_as_string", ""))
+                     for slot in bucket["per_slot"]["buckets"]]
+        else:
+            slots = [slot["doc_count"] for slot in bucket["per_slot"]["buckets"]]
+
+        alerts.append((signature, signature_id, bucket["doc_count"], last_hit, slots))
+    return alerts
+
+
+def _alerts_query(window, severities=None):
+    must = [
+        {"range": {"@timestamp": {
+            "gte": int(window.start.timestamp() * 1000),
+            "lt": int(window.end.timestamp() * 1000),
+            "format": "epoch_millis",
+        }}},
+        {"match": {"event_type": "alert"}},
+    ]
+    if severities:
+        must.append({"terms": {"alert.severity": list(severities)}})
+    return {"bool": {"must": must}}
+
+
+def query_suricata_alerts(window, severities=None):
+    """Aggregate the Suricata alerts of the window on the OpenSearch side.
+
+    Only bucket counts come back: one bucket per signature_id holding the
+    signature name, the last hit and the count per window slot.
+    Returns [(signature, signature_id, count, last_hit, [count per slot])].
+    """
+    query = {"size": 0, "query": _alerts_query(window, severities), "aggs": _signature_aggs(window)}
+    # Upstream errors propagate so the report marks the section unavailable
+    data = opensearch_search(OPENSEARCH_URL, OPENSEARCH_SURICATA_INDEX, query)
+    return _signature_rows(data.get("aggregations", {}), slot_hits=False)
+
+
+def query_suricata_alerts_by_severity(window):
+    """Like query_suricata_alerts, split by every alert.severity that occurs (for the rollups).
+
+    Returns {severity: [(signature, signature_id, count, last_hit, [(count, last_hit) per slot])]}.
+    """
+    query = {
+        "size": 0,
+        "query": _alerts_query(window),
+        "aggs": {
+            "severities": {
+                "terms": {"field": "alert.severity", "size": SURICATA_SEVERITY_BUCKETS},
+                "aggs": _signature_aggs(window),
+            }
+        }
+    }
+    data = opensearch_search(OPENSEARCH_URL, OPENSEARCH_SURICATA_INDEX, query)
+    return {
+        int(bucket["key"]): _signature_rows(bucket, slot_hits=True)
+        for bucket in data.get("aggregations", {}).get("severities", {}).get("buckets", [])
+    }
+
+
+@split_live_window(_merge_alerts)
+@memoize_closed_window
+@memoize_per_build
+def fetch_suricata_alerts(window, severities=None):
+    """Per-signature alert counts of the window, from the hourly rollups when they cover it."""
+    if not report_rollups.covers("suricata_alerts", window):
+        return query_suricata_alerts(window, severities)
+
+    alerts = {}
+    for signature, sig_id, count, last_hit, hour in report_rollups.read_alerts(window, severities):
+        alert = alerts.setdefault(sig_id, [signature, sig_id, 0, "", [0] * len(window.labels)])
+        alert[2] += count
+        alert[3] = max(alert[3], last_hit or "")
+        slot = window.bucket_index(int(hour.timestamp()))
+        if slot is not None:
+            alert[4][slot] += count
+    return [tuple(alert) for alert in alerts.values()]
+
+
+def extract_short_signature(signature):
+    keywords = ["Port Scan", "DROP Listed", "SSH Scan", "Compromised", "Malware", "Dshield"]
+    for word in keywords:
+        if word in signature:
+            return word
+    return signature.split()[0]  # Default: use the first word if no match
+
+
+def get_threat_summary(window, limit, severities=None):
+    """Most frequent signatures: [last hit, signature (30 chars max), count]."""
+    alerts = fetch_suricata_alerts(window, severities)
+
+    # ✅ Sort threats by frequency
+    top_alerts = sorted(alerts, key=lambda alert: alert[2], reverse=True)[:limit]
+
+    threats = []
+    for signature, sig_id, count, last_hit, _ in top_alerts:
+        # ✅ Limit signature length to 30 characters
+        if len(signature) > 30:
+            signature = signature[:30] + "..."
+
+        # ✅ Convert timestamp to readable format
+        converted_time = parser.isoparse(last_hit).strftime('%Y-%m-%d %H:%M:%S') if last_hit else ""
+
+        threats.append([converted_time, signature, str(count)])
+
+    return threats
+
+
+def get_threat_history(window, limit, severities=None):
+    """Per-slot counts of the `limit` most frequent threat categories."""
+    alerts = fetch_suricata_alerts(window, severities)
+    threat_counts = {}
+
+    for signature, sig_id, count, last_hit, slots in alerts:
+        short_signature = extract_short_signature(signature)
+        counts = threat_counts.setdefault(short_signature, [0] * len(window.labels))
+        for i, slot_count in enumerate(slots):
+            counts[i] += slot_count
+
+    # ✅ Keep the most frequent categories
+    top_threats = sorted(threat_counts.items(), key=lambda item: (-sum(item[1]), item[0]))[:limit]
+    return dict(top_threats)
@@ -0,0 +1,153 @@
+import os
+import re
+from datetime import datetime
+from dotenv import load_dotenv
+from pathlib import Path
+dotenv_path = Path(__file__).resolve().parents[1] / '.env'
+load_dotenv(dotenv_path)
+
+import report_rollups
+from report_cache import memoize_per_build, memoize_closed_window, split_live_window, add_series
+from opensearch_client import opensearch_search
+
+BASE_URL = os.getenv("OPENSEARCH_URL")
+INDEX_NAME = os.getenv("OPENSEARCH_INDEX")
+USER = os.getenv("OPENSEARCH_USER")
+PASSWORD = os.getenv("OPENSEARCH_PASS")
+
+# Keyword field holding the monitor name (used for server-side filtering and bucketing)
+MONITOR_FIELD = os.getenv("OPENSEARCH_MONITOR_FIELD", "monitor_name.keyword")
+
+# Allowed Monitor Names (Filter only these monitors)
+ALLOWED_MONITORS = {"ENG KMUTNB", "ECE ENG", "KMUTNB"}
+
+
+def clean_message(message):
+    """Remove emojis, special characters, and line breaks from the message."""
+    # Remove emojis and special symbols
+    clean_msg = re.sub(r"[\U00010000-\U0010ffff]", "", message)
+    # Remove line breaks and extra spaces
+    clean_msg = clean_msg.replace("\n", " ").strip()
+    return clean_msg
+
+
+def _auth():
+    return (USER, PASSWORD) if USER and PASSWORD else None
+
+
+def _down_events_query(window):
+    """'Down' events of the allowed monitors inside the window."""
+    return {
+        "bool": {
+            "must": [
+                {"range": {"@timestamp": {
+                    "gte": int(window.start.timestamp() * 1000),
+                    "lt": int(window.end.timestamp() * 1000),
+                    "format": "epoch_millis",
+                }}},
+                {"match_phrase": {"message": "Down"}}
+            ],
+            "filter": [
+                {"terms": {MONITOR_FIELD: sorted(ALLOWED_MONITORS)}}  # Only allowed monitors
+            ]
+        }
+    }
+
+
+@memoize_closed_window
+def get_web_issues(window, limit):
+    """Newest 'Down' events of the window for the web application table."""
+    query = {
+        "query": _down_events_query(window),
+        "size": limit,
+        "sort": [{"@timestamp": {"order": "desc"}}],  # Sort by most recent
+    }
+    # Upstream errors propagate so the report marks the section unavailable
+    data = opensearch_search(BASE_URL, INDEX_NAME, query, auth=_auth(), verify=False)  # Ignore SSL verification if necessary
+
+    web_issues = []
+    for hit in data.get("hits", {}).get("hits", []):
+        source = hit["_source"]
+        timestamp = source.get("@timestamp", "")
+        monitor_name = source.get("monitor_name", "Unknown")
+        message = source.get("message", "")
+        status = "Down" if "Down" in message else "Unknown"
+
+        # Extract issue description (after "]"), clean it and cut it to 25 characters
+        issue_description = message.split("]")[-1].strip() if "]" in message else message
+        issue_description = clean_message(issue_description)
+        issue_description = issue_description[:25] + "..." if len(issue_description) > 25 else issue_description
+
+        # Format timestamp to readable format
+        try:
+            formatted_time = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%fZ").strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            formatted_time = timestamp  # Fallback if parsing fails
+
+        web_issues.append([formatted_time, monitor_name, status, issue_description])
+
+    return web_issues
+
+
+def query_web_downtime(window):
+    """Count 'Down' events per monitor and window slot.
+
+    Bucketing happens in OpenSearch (terms on the monitor × date_range on the
+    window edges), so every event is counted and only bucket counts come back.
+    """
+    query = {
+        "size": 0,
+        "query": _down_events_query(window),
+        "aggs": {
+            "monitors": {
+                "terms": {"field": MONITOR_FIELD, "size": len(ALLOWED_MONITORS)},
+                "aggs": {
+                    "per_slot": {
+                        "date_range": {
+                            "field": "@timestamp",
+                            "format": "epoch_millis",
+                            "ranges": [
+                                {"from": stamp * 1000, "to": next_stamp * 1000}
+                                for stamp, next_stamp in zip(window.edge_stamps, window.edge_stamps[1:])
+                            ],
+                        }
+                    }
+                }
+            }
+        }
+    }
+    data = opensearch_search(BASE_URL, INDEX_NAME, query, auth=_auth(), verify=False)
+
+    # ✅ Every allowed monitor gets a series, even without downtime
+    web_downtime = {monitor: [0] * len(window.labels) for monitor in ALLOWED_MONITORS}
+
+    for monitor_bucket in data.get("aggregations", {}).get("monitors", {}).get("buckets", []):
+        monitor_name = monitor_bucket["key"]
+        if monitor_name not in web_downtime:
+            continue
+        # date_range buckets come back in the order of the requested ranges
+        for i, slot_bucket in enumerate(monitor_bucket["per_slot"]["buckets"]):
+            web_downtime[monitor_name][i] = slot_bucket["doc_count"]
+
+    return web_downtime
+
+
+@split_live_window(lambda head, tail, slot: add_series(head, tail))
+@memoize_closed_window
+@memoize_per_build
+def get_web_downtime(window):
+    """'Down' events per monitor and window slot, from the hourly rollups when they cover the window."""
+    if not report_rollups.covers("downtime", window):
+        return query_web_downtime(window)
+
+    web_downtime = {monitor: [0] * len(window.labels) for monitor in ALLOWED_MONITORS}
+    for monitor, count, hour in report_rollups.read_downtime(window):
+        slot = window.bucket_index(int(hour.timestamp()))
+        if monitor in web_downtime and slot is not None:
+            web_downtime[monitor][slot] += count
+    return web_downtime
+
+
+def count_web_downtime(window):
+    """Total 'Down' events in the window (from the same aggregation as the chart)."""
+    return sum(sum(counts) for counts in get_web_downtime(window).values())
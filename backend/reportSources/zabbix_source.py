@@ -0,0 +1,243 @@
+from datetime import datetime
+from collections import defaultdict
+
+import report_rollups
+from report_cache import memoize_per_build, memoize_closed_window, split_live_window, add_series
+from cpu_resample import to_arrays, trend_value_key, resample_hosts
+from zabbix_queries import (
+    iter_events, newest_events, count_problem_events, get_group_id, get_group_hosts,
+    get_cpu_itemids, fetch_cpu_history, fetch_cpu_trends,
+)
+
+NETWORK_GROUP = "Discovered hosts"
+SERVER_GROUP = "Zabbix servers"
+
+# Raw history up to this period length (seconds); longer periods read hourly trends
+CPU_HISTORY_MAX_WINDOW = 2 * 86400
+
+
+def problem_events(group_id, window):
+    return iter_events({
+        "output": ["clock", "name", "objectid"],
+        "selectHosts": ["host"],
+        "groupids": [group_id],
+        "source": 0,  # Triggers only
+        "value": 1,  # Problems only
+        "time_from": window.time_from,
+        "time_till": window.time_till,
+    })
+
+
+def require_group_id(group_name):
+    """Group ID or RuntimeError: an empty result would be cached for closed windows."""
+    group_id = get_group_id(group_name)
+    if not group_id:
+        raise RuntimeError(f"Could not find '{group_name}' group.")
+    return group_id
+
+
+def short_description(full_problem_description):
+    """Problem name without the device prefix, cut to 25 characters."""
+    # Remove device name before colon (e.g., FortiGate: -> just the description)
+    if ":" in full_problem_description:
+        description = full_problem_description.split(":", 1)[-1].strip()
+    else:
+        description = full_problem_description
+    return description[:25] + "..." if len(description) > 25 else description
+
+
+def _network_problems_from_rollups(window):
+    """Same result as collect_network_problems, summed from the hourly rollups."""
+    issues = {}
+    problem_history = defaultdict(lambda: [0] * len(window.labels))
+    for host, problem, count, last_clock, hour in report_rollups.read_problems(window, NETWORK_GROUP):
+        short = short_description(problem)
+        row = issues.setdefault((host, problem), [None, host, short, 0, 0, problem])
+        row[3] += count
+        if last_clock >= row[4]:
+            row[0] = datetime.fromtimestamp(last_clock).strftime("%Y-%m-%d %H:%M:%S")
+            row[4] = last_clock
+        slot = window.bucket_index(int(hour.timestamp()))
+        if slot is not None:
+            problem_history[short][slot] += count
+    return {"issues": list(issues.values()), "problem_history": dict(problem_history)}
+
+
+def _merge_network_problems(head, tail, slot):
+    issues = {(row[1], row[5]): row for row in head["issues"]}
+    for row in tail["issues"]:
+        key = (row[1], row[5])
+        if key in issues:
+            # The tail holds the most recent occurrence; counts add up
+            issues[key] = row[:3] + [issues[key][3] + row[3]] + row[4:]
+        else:
+            issues[key] = row
+    return {
+        "issues": list(issues.values()),
+        "problem_history": add_series(head["problem_history"], tail["problem_history"]),
+    }
+
+
+@split_live_window(_merge_network_problems)  # Finished slots come from the closed-window cache
+@memoize_closed_window
+@memoize_per_build
+def collect_network_problems(window):
+    """One pass over the network problem events of the window.
+
+    Returns the per-(host, problem) table and the per-slot problem counts.
+    """
+    if report_rollups.covers("problems", window):
+        return _network_problems_from_rollups(window)
+
+    group_id = require_group_id(NETWORK_GROUP)  # Cached with ZABBIX_METADATA_TTL
+
+    issue_counts = defaultdict(lambda: {"time": None, "count": 0, "timestamp": 0, "full_issue": ""})
+    problem_history = defaultdict(lambda: [0] * len(window.labels))
+
+    # Events arrive oldest first, page by page; only totals and slot counts are kept
+    for issue in problem_events(group_id, window):
+        timestamp = int(issue["clock"])
+        host = issue["hosts"][0]["host"] if "hosts" in issue and issue["hosts"] else "Unknown"
+        full_problem_description = issue.get("name", "Unknown Issue")
+        shortened_description = short_description(full_problem_description)
+
+        key = (host, full_problem_description)
+
+        # Keep the time of the most recent occurrence
+        if timestamp >= issue_counts[key]["timestamp"]:
+            issue_counts[key]["time"] = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            issue_counts[key]["timestamp"] = timestamp
+            issue_counts[key]["full_issue"] = shortened_description
+        issue_counts[key]["count"] += 1
+
+        slot = window.bucket_index(timestamp)
+        if slot is not None:
+            problem_history[shortened_description][slot] += 1
+
+    return {
+        "issues": [[info["time"], host, info["full_issue"], info["count"], info["timestamp"], problem]
+                   for (host, problem), info in issue_counts.items()],
+        "problem_history": dict(problem_history),
+    }
+
+
+def get_network_issues(window):
+    """Per-(host, problem) rows, most frequent first: [last time, host, problem, count]."""
+    issues = sorted(collect_network_problems(window)["issues"], key=lambda row: (-row[3], -row[4]))
+    return [row[:4] for row in issues]
+
+
+def get_problem_history(window):
+    """Per-slot counts per problem, most frequent first (the chart draws the first few)."""
+    history = collect_network_problems(window)["problem_history"]
+    ordered = sorted(history.items(), key=lambda item: (-sum(item[1]), item[0]))
+    return dict(ordered) or {"No Data": [0] * len(window.labels)}
+
+
+@memoize_closed_window
+def get_server_issues(window, limit):
+    """Newest server problems of the window, with their age at the end of the window."""
+    group_id = require_group_id(SERVER_GROUP)
+
+    # One event.get for the newest `limit` events instead of streaming the whole window
+    events = newest_events({
+        "output": ["clock", "name"],
+        "selectHosts": ["host"],
+        "groupids": [group_id],
+        "source": 0,  # Triggers only
+        "value": 1,  # Problems only
+        "time_from": window.time_from,
+        "time_till": window.time_till,
+    }, limit)
+
+    server_issues = []
+    window_end = int(window.end.timestamp())
+
+    for issue in events:
+        formatted_time = datetime.fromtimestamp(int(issue["clock"])).strftime("%Y-%m-%d %H:%M:%S")
+        host = issue["hosts"][0]["host"] if "hosts" in issue and issue["hosts"] else "Unknown"
+        full_problem_description = issue.get("name", "Unknown Issue")
+
+        # Cut problem description to 30 characters if too long
+        shortened_description = (
+            full_problem_description[:30] + "..." if len(full_problem_description) > 30 else full_problem_description
+        )
+
+        duration_seconds = window_end - int(issue["clock"])
+        days, remainder = divmod(duration_seconds, 86400)
+        hours, remainder = divmod(remainder, 3600)
+        minutes = remainder // 60
+        duration_str = f"{days}d {hours}h {minutes}m"
+
+        server_issues.append([formatted_time, host, shortened_description, duration_str])
+
+    return server_issues
+
+
+@split_live_window(lambda head, tail, slot: head + tail)
+@memoize_closed_window
+def count_problems(window, group_name):
+    """Count problem events of a host group with countOutput instead of downloading them."""
+    if report_rollups.covers("problems", window):
+        return sum(row[2] for row in report_rollups.read_problems(window, group_name))
+
+    group_id = require_group_id(group_name)
+    return count_problem_events([group_id], window.time_from, window.time_till)
+
+
+def _merge_cpu_usage(head, tail, slot):
+    # Slots are disjoint: finished slots from the head, the running ones from the tail
+    hosts = list(head) + [host for host in tail if host not in head]
+    merged = {}
+    for host in hosts:
+        head_values = head.get(host) or [0] * len(tail.get(host, []))
+        tail_values = tail.get(host) or [0] * len(head_values)
+        merged[host] = head_values[:slot] + tail_values[slot:]
+    return merged
+
+
+@split_live_window(_merge_cpu_usage)
+@memoize_closed_window
+def get_cpu_usage(window):
+    """CPU utilisation per server host, aligned on the window slots."""
+    if report_rollups.covers("cpu", window):
+        # Hourly min/avg/max rows hold the same values as Zabbix trends
+        value_key = trend_value_key()
+        rows_by_host = defaultdict(list)
+        for host, hour, value_min, value_avg, value_max in report_rollups.read_cpu(window):
+            value = {"value_min": value_min, "value_avg": value_avg, "value_max": value_max}[value_key]
+            if value is not None:
+                rows_by_host[host].append({"clock": int(hour.timestamp()), "value": value})
+        series = {host: to_arrays(rows) for host, rows in rows_by_host.items()}
+        return resample_hosts(series, window.edge_stamps)
+
+    group_id = require_group_id(SERVER_GROUP)
+    hosts = get_group_hosts(group_id)  # Cached with ZABBIX_METADATA_TTL
+
+    host_items = get_cpu_itemids(list(hosts.keys()))
+    item_ids = list(host_items.values())
+
+    # Raw history for short periods; hourly trends (min/avg/max) for long ones
+    if window.period_seconds <= CPU_HISTORY_MAX_WINDOW:
+        cpu_data_by_item = fetch_cpu_history(item_ids, window.time_from, window.time_till)
+        value_key = "value"
+    else:
+        cpu_data_by_item = fetch_cpu_trends(item_ids, window.time_from, window.time_till)
+        value_key = trend_value_key()
+
+    series = {}
+    for host_id, host_name in hosts.items():
+        item_id = host_items.get(host_id)
+        if not item_id:
+            print(f"⚠️ No valid CPU item found for {host_name} (Host ID: {host_id})")
+            continue
+
+        cpu_data = cpu_data_by_item.get(item_id, [])
+        if not cpu_data:
+            print(f"⚠️ Warning: No CPU data found for {host_name}.")
+            continue
+
+        series[host_name] = to_arrays(cpu_data, value_key)
+
+    # Vectorized slot alignment (mean/max/p95 per slot, see CPU_SLOT_AGGREGATION)
+    return resample_hosts(series, window.edge_stamps)
@@ -0,0 +1,159 @@
+import os
+import copy
+import contextvars
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import report_store
+
+# Source results kept for closed (past) reporting windows, least recently used evicted first
+REPORT_WINDOW_CACHE_SIZE = int(os.getenv("REPORT_WINDOW_CACHE_SIZE", "256"))
+
+# The memoization scope of the report build currently running (None outside a build)
+_build_scope = contextvars.ContextVar("report_build_scope", default=None)
+
+
+class BuildScope:
+    """Results of upstream queries made during one report build.
+
+    Concurrent callers asking for the same query share a single Future, so the
+    query runs once even when several fetchers need it at the same time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = Future()
+                self._entries[key] = entry
+
+        if owner:
+            try:
+                entry.set_result(compute())
+            except Exception as e:
+                entry.set_exception(e)
+        return entry.result()
+
+
+@contextmanager
+def build_scope():
+    """Open a memoization scope for one report build."""
+    token = _build_scope.set(BuildScope())
+    try:
+        yield
+    finally:
+        _build_scope.reset(token)
+
+
+def memoize_per_build(func):
+    """Run `func` at most once per argument set inside a build_scope()."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        scope = _build_scope.get()
+        if scope is None:
+            return func(*args, **kwargs)
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        return scope.get_or_compute(key, lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+_window_cache = OrderedDict()
+_window_cache_lock = threading.Lock()
+
+
+def _window_key(func, window, args, kwargs):
+    return "|".join([
+        f"{func.__module__}.{func.__qualname__}",
+        window.start.isoformat(), window.end.isoformat(),
+        ",".join(str(stamp) for stamp in window.edge_stamps),
+        repr(args), repr(sorted(kwargs.items())),
+    ])
+
+
+def memoize_closed_window(func):
+    """Keep results of `func(window, ...)` for windows that are entirely in the past.
+
+    A closed window never changes upstream, so its result is reused by every
+    later build (e.g. regenerating last month's report): first from memory
+    (REPORT_WINDOW_CACHE_SIZE entries), then from the on-disk report_store,
+    which survives restarts. Open windows always query the upstream.
+    """
+
+    @functools.wraps(func)
+    def wrapper(window, *args, **kwargs):
+        if not window.closed:
+            return func(window, *args, **kwargs)
+
+        key = _window_key(func, window, args, kwargs)
+        with _window_cache_lock:
+            if key in _window_cache:
+                _window_cache.move_to_end(key)
+                return copy.deepcopy(_window_cache[key])  # Callers may modify their copy
+
+        result = report_store.load(key)
+        if result is None:
+            result = func(window, *args, **kwargs)  # Errors propagate and are not cached
+            report_store.save(key, result)
+
+        if REPORT_WINDOW_CACHE_SIZE > 0:
+            with _window_cache_lock:
+                _window_cache[key] = copy.deepcopy(result)
+                while len(_window_cache) > REPORT_WINDOW_CACHE_SIZE:
+                    _window_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def split_live_window(merge):
+    """Serve the finished slots of a live window from the closed-window cache.
+
+    A window that is still running (e.g. today's daily report) is split at
+    its slot edges: every finished slot is its own closed window (cached
+    once computed, whatever the time of the next build) and only the running
+    slot is queried upstream. `merge(done, part, slot)` adds a part to the
+    result of the slots before it; `slot` is the first slot of the part.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(window, *args, **kwargs):
+            parts = window.split_at_slot_edges() if window.live else None
+            if parts is None:
+                return func(window, *args, **kwargs)
+            result = func(parts[0][1], *args, **kwargs)
+            for slot, part in parts[1:]:
+                result = merge(result, func(part, *args, **kwargs), slot)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def add_series(head, tail):
+    """Element-wise sum of two {name: [count per slot]} results."""
+    merged = {name: list(values) for name, values in head.items()}
+    for name, values in tail.items():
+        if name in merged:
+            merged[name] = [a + b for a, b in zip(merged[name], values)]
+        else:
+            merged[name] = list(values)
+    return merged
+
+
+def clear_window_cache():
+    """Drop every cached closed-window result, in memory and on disk."""
+    with _window_cache_lock:
+        _window_cache.clear()
+    report_store.clear()
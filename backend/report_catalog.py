@@ -0,0 +1,210 @@
+import os
+import time
+import hashlib
+from datetime import datetime
+
+from sqlalchemy import asc, desc, func
+from sqlalchemy.exc import IntegrityError
+
+from database import SessionLocal
+from models import ReportFile
+
+REPORT_SOURCES = ("custom", "schedule")
+REPORT_TYPES = ("daily", "weekly", "monthly")
+SORT_FIELDS = {
+    "created_at": ReportFile.created_at,
+    "file_name": ReportFile.file_name,
+    "size_bytes": ReportFile.size_bytes,
+    "window_start": ReportFile.window_start,
+    "duration_seconds": ReportFile.duration_seconds,
+}
+REPORTS_ROOT = "generated_reports"
+MAX_PAGE_SIZE = 200
+
+
+def report_folder(source, report_type):
+    return os.path.join(REPORTS_ROOT, f"{source}_report", report_type)
+
+
+def allocate_report_path(source, report_type, file_name, created_by=None):
+    """Claim a unique report path with one INSERT per candidate name.
+
+    The unique index on `path` makes concurrent requests (or API workers)
+    pick different names: "name.pdf", "name-2.pdf", ... Returns (report_id, path).
+    """
+    folder = report_folder(source, report_type)
+    os.makedirs(folder, exist_ok=True)
+    base_name = file_name.rsplit(".", 1)[0]
+    version = 1
+    while True:
+        candidate = file_name if version == 1 else f"{base_name}-{version}.pdf"
+        path = os.path.join(folder, candidate)
+        # Files from before the catalog existed are not in the table yet
+        if not os.path.exists(path):
+            with SessionLocal() as db:
+                entry = ReportFile(source=source, report_type=report_type, file_name=candidate,
+                                   path=path, status="building", created_by=created_by)
+                db.add(entry)
+                try:
+                    db.commit()
+                    return entry.id, path
+                except IntegrityError:
+                    db.rollback()  # Taken by another request, try the next version
+        version += 1
+
+
+def _checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def update_report(report_id, **fields):
+    """Set columns of a catalog entry (status, progress, ...) in their own transaction."""
+    with SessionLocal() as db:
+        entry = db.get(ReportFile, report_id)
+        if entry is not None:
+            for key, value in fields.items():
+                setattr(entry, key, value)
+            db.commit()
+
+
+def cataloged_build(report_id, build):
+    """Wrap a report builder so the catalog entry records its outcome.
+
+    The wrapper has the builder's signature (file_path, **options); on success
+    the entry gets the period window, size, SHA-256 and generation time, on
+    failure the error.
+    """
+
+    def run(file_path, **options):
+        started = time.monotonic()
+        try:
+            window = build(file_path, **options)
+        except Exception as e:
+            update_report(report_id, status="failed", stage="Failed", error=str(e),
+                          duration_seconds=time.monotonic() - started)
+            raise
+        update_report(report_id, status="ready", progress=100, stage="Completed",
+                      window_start=getattr(window, "start", None), window_end=getattr(window, "end", None),
+                      size_bytes=os.path.getsize(file_path), checksum=_checksum(file_path),
+                      duration_seconds=time.monotonic() - started)
+        return window
+
+    return run
+
+
+def entry_to_dict(entry):
+    return {
+        "id": entry.id,
+        "source": entry.source,
+        "report_type": entry.report_type,
+        "file_name": entry.file_name,
+        "status": entry.status,
+        "progress": entry.progress,
+        "stage": entry.stage,
+        "error": entry.error,
+        "window_start": entry.window_start,
+        "window_end": entry.window_end,
+        "size_bytes": entry.size_bytes,
+        "checksum": entry.checksum,
+        "duration_seconds": entry.duration_seconds,
+        "created_by": entry.created_by,
+        "created_at": entry.created_at,
+    }
+
+
+def list_reports(db, source=None, report_type=None, status=None, created_by=None, date_from=None, date_to=None,
+                 sort="created_at", order="desc", page=1, page_size=50, search=None):
+    """One page of catalog entries (index on source, report_type, created_at).
+
+    `search` keeps the entries whose file name contains it (case-insensitive).
+    """
+    query = db.query(ReportFile)
+    if source:
+        query = query.filter(ReportFile.source == source)
+    if report_type:
+        query = query.filter(ReportFile.report_type == report_type)
+    if status:
+        query = query.filter(ReportFile.status == status)
+    else:
+        query = query.filter(ReportFile.status != "deleted")
+    if created_by:
+        query = query.filter(ReportFile.created_by == created_by)
+    if date_from:
+        query = query.filter(ReportFile.created_at >= date_from)
+    if date_to:
+        query = query.filter(ReportFile.created_at < date_to)
+    if search:
+        query = query.filter(ReportFile.file_name.icontains(search, autoescape=True))
+
+    total = query.with_entities(func.count(ReportFile.id)).scalar()
+    column = SORT_FIELDS.get(sort, ReportFile.created_at)
+    ordering = asc(column) if order == "asc" else desc(column)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    page = max(1, page)
+    entries = query.order_by(ordering, desc(ReportFile.id)).offset((page - 1) * page_size).limit(page_size).all()
+
+    return {
+        "items": [entry_to_dict(entry) for entry in entries],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+    }
+
+
+def file_names(db, source):
+    """{report_type: [file_name]} of the ready reports, newest first (legacy listing shape)."""
+    names = {report_type: [] for report_type in REPORT_TYPES}
+    rows = db.query(ReportFile.report_type, ReportFile.file_name).filter(
+        ReportFile.source == source, ReportFile.status == "ready",
+    ).order_by(desc(ReportFile.created_at)).all()
+    for report_type, file_name in rows:
+        names.setdefault(report_type, []).append(file_name)
+    return names
+
+
+def find_report(db, source, report_type, file_name):
+    return db.query(ReportFile).filter(ReportFile.path == os.path.join(report_folder(source, report_type), file_name)).first()
+
+
+def mark_deleted(db, entry):
+    """Keep the row as a tombstone: its name is never handed out again, so a
+    report URL always refers to the same bytes (lets clients cache them forever)."""
+    entry.status = "deleted"
+    db.commit()
+
+
+def sync_catalog():
+    """Add PDFs already on disk (e.g. from before the catalog) that have no entry yet.
+
+    Run once at startup; listing requests never scan the directories. Every
+    API worker runs it, so each file is committed on its own and a file that
+    another worker added first (unique path) is skipped.
+    """
+    added = 0
+    with SessionLocal() as db:
+        known = {path for (path,) in db.query(ReportFile.path).all()}
+        for source in REPORT_SOURCES:
+            for report_type in REPORT_TYPES:
+                folder = report_folder(source, report_type)
+                if not os.path.isdir(folder):
+                    continue
+                for name in os.listdir(folder):
+                    path = os.path.join(folder, name)
+                    if path in known or not name.endswith(".pdf") or not os.path.isfile(path):
+                        continue
+                    stat = os.stat(path)
+                    db.add(ReportFile(source=source, report_type=report_type, file_name=name, path=path,
+                                      status="ready", progress=100, stage="Completed",
+                                      size_bytes=stat.st_size, checksum=_checksum(path),
+                                      created_at=datetime.fromtimestamp(stat.st_mtime)))
+                    try:
+                        db.commit()
+                        added += 1
+                    except IntegrityError:
+                        db.rollback()  # Added by another worker meanwhile
+    if added:
+        print(f"✅ Report catalog: {added} existing file(s) added")
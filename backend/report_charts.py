@@ -0,0 +1,204 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")  # pandas still imports pyplot; keep it headless
+import matplotlib.ticker as mticker
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import pandas as pd
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable
+
+from report_vector_charts import VECTOR_RENDERERS
+
+# Chart worker processes (0 renders inline in the calling process)
+REPORT_CHART_WORKERS = int(os.getenv("REPORT_CHART_WORKERS", str(min(5, os.cpu_count() or 1))))
+# Seconds to wait for one chart before rendering it inline instead
+REPORT_CHART_TIMEOUT = float(os.getenv("REPORT_CHART_TIMEOUT", "120"))
+# Default chart backend: "raster" (matplotlib PNGs) or "vector" (native ReportLab drawings)
+REPORT_CHART_BACKEND = os.getenv("REPORT_CHART_BACKEND", "raster")
+CHART_BACKENDS = ("raster", "vector")
+
+LINE_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+###############################################################################
+# Render functions (top-level so they can be pickled to the worker processes)
+###############################################################################
+def _new_axes(figsize, dpi):
+    """Axes on a figure of our own: pyplot's global current figure is shared by
+    every thread, so two builds rendering inline would draw on each other's charts."""
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure.add_subplot()
+
+
+def _png_bytes(ax, dpi):
+    """Save the figure of `ax` as PNG bytes."""
+    buffer = BytesIO()
+    ax.figure.tight_layout()
+    ax.figure.savefig(buffer, format="png", bbox_inches='tight', transparent=True, dpi=dpi)
+    return buffer.getvalue()
+
+
+def render_line_chart(index, series, title, xlabel, ylabel,
+                      y_axis="count", colors_list=LINE_COLORS, figsize=(7, 4), dpi=150):
+    """One line per series as PNG bytes; y_axis is "count", "count_from_zero" or "percent"."""
+    ax = _new_axes(figsize, dpi)
+    for (name, values), color in zip(series.items(), colors_list):
+        ax.plot(index, values, marker="o", label=name, color=color, linewidth=2)
+
+    if y_axis == "percent":
+        ax.set_ylim(0, 80)  # Limit scale between 0% and 80%
+        ax.yaxis.set_major_locator(mticker.MultipleLocator(10))  # Steps of 10%
+        ax.yaxis.set_major_formatter(mticker.PercentFormatter(xmax=100))  # Format as %
+    elif y_axis == "count_from_zero":
+        ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True, min_n_ticks=1))
+        ax.set_ylim(bottom=0)  # Ensure Y-axis starts at zero
+    else:
+        ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))  # Ensure whole numbers only
+
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+    return _png_bytes(ax, dpi)
+
+
+def render_bar_chart(index, series, title, xlabel, ylabel,
+                     colors_list=None, figsize=(8, 5), dpi=150):
+    """Grouped bars, one color per series, as PNG bytes."""
+    ax = _new_axes(figsize, dpi)
+    # Draw on our axes: without ax= pandas opens (and leaks) a second, default-sized figure
+    pd.DataFrame(series, index=index).plot(kind="bar", ax=ax, color=colors_list, edgecolor='black')
+
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+    return _png_bytes(ax, dpi)
+
+
+def render_pie_chart(values, title, colors_list=None, figsize=(4, 4), dpi=150):
+    """Pie of {label: value} as PNG bytes."""
+    ax = _new_axes(figsize, dpi)
+    pd.Series(values).plot(kind="pie", ax=ax, autopct="%1.1f%%", colors=colors_list,
+                           startangle=140, wedgeprops={'edgecolor': 'black'})
+    ax.set_ylabel("")  # Remove default y-label
+
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+    return _png_bytes(ax, dpi)
+
+
+###############################################################################
+# Process pool
+###############################################################################
+def get_pool():
+    """Shared chart pool, created on first use. None when charts render inline."""
+    global _pool
+    if REPORT_CHART_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking the threaded API process is not safe
+                _pool = ProcessPoolExecutor(max_workers=REPORT_CHART_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+class ChartBatch:
+    """Charts of one report, rendered in parallel while the story is assembled.
+
+    With backend="vector" nothing is rendered ahead: image() returns a
+    native ReportLab drawing built from the same arguments.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or REPORT_CHART_BACKEND
+        if self.backend not in CHART_BACKENDS:
+            raise ValueError(f"Unknown chart backend: {self.backend}")
+        self._charts = []
+        self._results = {}
+
+    def submit(self, render, **spec):
+        """Queue a chart and return its handle for image()."""
+        if self.backend == "vector":
+            self._charts.append((None, render, spec))
+            return len(self._charts) - 1
+
+        pool = get_pool()
+        future = None
+        if pool is not None:
+            try:
+                future = pool.submit(render, **spec)
+            except Exception as e:  # Broken or shut down pool
+                print(f"⚠️ Chart pool unavailable, rendering inline: {e}")
+                _reset_pool()
+        if future is None:
+            future = Future()
+            future.set_result(render(**spec))
+        self._charts.append((future, render, spec))
+        return len(self._charts) - 1
+
+    def png(self, chart):
+        """PNG bytes of a chart; a failed worker falls back to inline rendering."""
+        if chart not in self._results:
+            future, render, spec = self._charts[chart]
+            try:
+                self._results[chart] = future.result(timeout=REPORT_CHART_TIMEOUT)
+            except Exception as e:
+                print(f"⚠️ Chart worker failed ({e}), rendering inline")
+                self._results[chart] = render(**spec)
+        return self._results[chart]
+
+    def wait(self):
+        """Block until every chart is rendered."""
+        if self.backend == "vector":
+            return
+        for chart in range(len(self._charts)):
+            self.png(chart)
+
+    def image(self, chart, width, height):
+        """Flowable that draws the chart straight from memory."""
+        if self.backend == "vector":
+            _, render, spec = self._charts[chart]
+            return VECTOR_RENDERERS[render.__name__](width, height, **spec)
+        return ChartImage(self, chart, width, height)
+
+
+class ChartImage(Flowable):
+    """Chart placed in the story before it is rendered; the PNG is read from the batch when drawn."""
+
+    def __init__(self, batch, chart, width, height):
+        Flowable.__init__(self)
+        self._batch = batch
+        self._chart = chart
+        self.drawWidth = width
+        self.drawHeight = height
+        self.hAlign = "CENTER"  # Same default as platypus.Image
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        image = ImageReader(BytesIO(self._batch.png(self._chart)))
+        self.canv.drawImage(image, 0, 0, self.drawWidth, self.drawHeight, mask="auto")
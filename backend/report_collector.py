@@ -0,0 +1,75 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Default time budget for a single data source (seconds, override in .env)
+REPORT_SOURCE_TIMEOUT = float(os.getenv("REPORT_SOURCE_TIMEOUT", "120"))
+REPORT_COLLECT_WORKERS = int(os.getenv("REPORT_COLLECT_WORKERS", "16"))
+# Longest a source may wait for a free worker before it is marked unavailable (seconds)
+REPORT_SOURCE_QUEUE_TIMEOUT = float(os.getenv("REPORT_SOURCE_QUEUE_TIMEOUT", "300"))
+
+# Dedicated pool for the blocking fetchers. It is never shut down, so a source
+# that overruns its timeout keeps its thread without holding up the report.
+_executor = ThreadPoolExecutor(max_workers=REPORT_COLLECT_WORKERS, thread_name_prefix="report-source")
+
+
+async def _run_source(name, func, timeout):
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context (e.g. the build memoization scope) into the worker thread
+    context = contextvars.copy_context()
+    started = asyncio.Event()
+
+    def run():
+        loop.call_soon_threadsafe(started.set)
+        return context.run(func)
+
+    future = loop.run_in_executor(_executor, run)
+    try:
+        # The pool is shared by concurrent builds: the time budget starts when
+        # the source gets a worker; the wait in the queue has its own bound
+        await asyncio.wait_for(started.wait(), REPORT_SOURCE_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        future.cancel()  # Drops it from the queue if it still has not started
+        print(f"⚠️ Report source '{name}' waited {REPORT_SOURCE_QUEUE_TIMEOUT}s for a worker, skipping it")
+        return None
+
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        print(f"⚠️ Report source '{name}' timed out after {timeout}s")
+    except Exception as e:
+        print(f"⚠️ Report source '{name}' failed: {e}")
+    return None
+
+
+async def collect_sources_async(sources, timeouts=None):
+    """Run every fetcher in `sources` ({name: callable}) concurrently.
+
+    Each source gets its own timeout (from `timeouts`, else REPORT_SOURCE_TIMEOUT).
+    Returns ({name: result}, unavailable) where unavailable is the set of
+    sources that failed or timed out; their result is None.
+    """
+    timeouts = timeouts or {}
+    names = list(sources.keys())
+    results = await asyncio.gather(*[
+        _run_source(name, sources[name], timeouts.get(name, REPORT_SOURCE_TIMEOUT))
+        for name in names
+    ])
+    collected = dict(zip(names, results))
+    unavailable = {name for name, result in collected.items() if result is None}
+    return collected, unavailable
+
+
+def collect_sources(sources, timeouts=None):
+    """Blocking wrapper around collect_sources_async for the report builders.
+
+    Runs in report job workers and scheduler threads. Never call it from the
+    event loop (it would block the loop until every source is done); use
+    collect_sources_async there, or run the builder in a threadpool.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(collect_sources_async(sources, timeouts))
+    raise RuntimeError("collect_sources() blocks; call it from a worker thread, not the event loop")
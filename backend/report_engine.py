@@ -0,0 +1,309 @@
+from functools import partial
+from datetime import datetime
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import (
+    BaseDocTemplate, PageTemplate, Frame,
+    Paragraph, Spacer, Table, TableStyle
+)
+from report_collector import collect_sources
+from report_cache import build_scope
+from report_jobs import report_progress
+from report_charts import ChartBatch, render_line_chart, render_bar_chart, render_pie_chart
+from report_periods import PERIODS
+
+from reportSources.zabbix_source import (
+    NETWORK_GROUP, SERVER_GROUP, get_network_issues, get_problem_history,
+    get_server_issues, get_cpu_usage, count_problems,
+)
+from reportSources.uptimekuma_source import get_web_issues, get_web_downtime, count_web_downtime
+from reportSources.suricata_source import get_threat_summary, get_threat_history
+
+# Same look for every table in the report
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+BAR_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
+PIE_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
+
+
+def get_period(spec):
+    """Accept a PeriodSpec or the name of one of PERIODS ("daily", "weekly", "monthly")."""
+    return PERIODS[spec] if isinstance(spec, str) else spec
+
+
+def fit_slots(series, slots):
+    """Pad or cut every series to one value per chart slot."""
+    return {name: (list(values) + [0] * len(slots))[:len(slots)] for name, values in series.items()}
+
+
+def collect_report_data(spec, window):
+    """Fetch the report data for `window` at call time.
+
+    All Zabbix, Uptime Kuma and Suricata fetchers run concurrently with a
+    per-source timeout; a source that fails or times out is listed under
+    "unavailable" instead of stalling the whole report.
+    """
+    # Each distinct upstream query runs once per build; derived tables and counts share it
+    with build_scope():
+        results, unavailable = collect_sources({
+            "network_issues": partial(get_network_issues, window),
+            "problem_history": partial(get_problem_history, window),
+            "os_issues": partial(get_server_issues, window, spec.server_issue_limit),
+            "cpu_usage": partial(get_cpu_usage, window),
+            "count_problem": partial(count_problems, window, NETWORK_GROUP),
+            "count_server": partial(count_problems, window, SERVER_GROUP),
+            "web_issues": partial(get_web_issues, window, spec.web_issue_limit),
+            "web_downtime": partial(get_web_downtime, window),
+            "count_web": partial(count_web_downtime, window),
+            "threats_detected": partial(get_threat_summary, window, spec.threat_table_limit, spec.threat_severities),
+            "threats_history": partial(get_threat_history, window, spec.threat_series_limit, spec.threat_severities),
+        })
+
+    def section(name, default):
+        return default if results[name] is None else results[name]
+
+    return {
+        "report_date": datetime.now().strftime("%Y-%m-%d"),
+        "data_range": window.data_range(),
+        "unavailable": sorted(unavailable),
+
+        "network_issues": section("network_issues", []),
+        "problem_history": section("problem_history", {}),
+        "os_issues": section("os_issues", []),
+        "cpu_usage": section("cpu_usage", {}),
+        "web_issues": section("web_issues", []),
+        "web_downtime": section("web_downtime", {}),
+
+        "incident_summary": {
+            "Network Devices": section("count_problem", 0),
+            "Operating Systems": section("count_server", 0),
+            "Web Application": section("count_web", 0)
+        },
+
+        "threats_detected": section("threats_detected", []),
+        "threats_history": section("threats_history", {}),
+    }
+
+
+def add_unavailable_notice(story, styles, api_response, sections):
+    """Flag report sections whose data source failed or timed out."""
+    missing = [section for section in sections if section in api_response.get("unavailable", [])]
+    if missing:
+        story.append(Paragraph(
+            f"<font color='red'>Data unavailable: {', '.join(missing)} (source did not respond in time)</font>",
+            styles["Normal"]
+        ))
+        story.append(Spacer(1, 0.1*inch))
+
+###############################################################################
+# 1) Header & Footer Function
+###############################################################################
+
+
+def header_footer(canvas, doc):
+    page_width, page_height = A4
+    footer_y = 20
+    report_title = getattr(doc, "report_title", "Centralized Monitoring Report")
+
+    # ---------------- HEADER ----------------
+    canvas.setFont("Helvetica-Bold", 12)
+    # Left-aligned: Report title
+    canvas.drawString(doc.leftMargin, page_height - 50, report_title)
+    # Right-aligned: Page number
+    page_number = f"Page {doc.page}"
+    canvas.drawRightString(page_width - doc.rightMargin, page_height - 50, page_number)
+
+    # ---------------- FOOTER ----------------
+    canvas.setFont("Helvetica", 10)
+    canvas.drawString(doc.leftMargin, footer_y, report_title)
+    canvas.setFont("Helvetica-Bold", 10)
+    canvas.setFillColor(colors.red)
+    canvas.drawCentredString(page_width / 2, footer_y, "Confidential for internal use")
+    canvas.setFillColor(colors.black)
+    report_date = getattr(doc, "report_date", "Unknown Date")  # Default if missing
+    canvas.drawRightString(page_width - doc.rightMargin, footer_y, report_date)
+
+###############################################################################
+# 2) Main Report-Building Function
+###############################################################################
+def build_report(spec, filename, end=None, progress=None, chart_backend=None):
+    """Build the PDF report of one period (daily, weekly, monthly or a custom PeriodSpec).
+
+    The window is the period containing `end` (default: now), cut off at `end`;
+    it is returned so callers can record what the report covers.
+    """
+    spec = get_period(spec)
+    window = spec.window(end)
+    slots = window.labels
+    report_title = f"Centralized Monitoring {spec.title} Report"
+
+    # Charts render in parallel while the story is assembled ("raster" PNGs or "vector" drawings)
+    charts = ChartBatch(chart_backend)
+    # Collect data only when a report is requested so it always covers the current window
+    report_progress(progress, 5, "Collecting data")
+    api_response = collect_report_data(spec, window)
+
+    ###########################################################################
+    # A) Create the Document (BaseDocTemplate) and PageTemplate
+    ###########################################################################
+    doc = BaseDocTemplate(
+        filename,
+        pagesize=A4,
+        leftMargin=30,
+        rightMargin=30,
+        topMargin=70,     # Enough space for header
+        bottomMargin=50   # Enough space for footer
+    )
+    doc.title = filename
+    doc.report_title = report_title
+    doc.report_date = api_response.get("report_date", "Unknown Date")
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+
+    template = PageTemplate(id='PageTemplate', frames=[frame], onPage=header_footer)
+    doc.addPageTemplates([template])
+    styles = getSampleStyleSheet()
+    story = []
+
+    ###########################################################################
+    # B) TITLE PAGE-LIKE CONTENT
+    ###########################################################################
+    story.append(Paragraph(report_title, styles["Title"]))
+    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(f"Report Date: {api_response['report_date']}", styles["Normal"]))
+    story.append(Paragraph(f"Data Range: {api_response['data_range']}", styles["Normal"]))
+    story.append(Spacer(1, 0.5*inch))
+
+    ###########################################################################
+    # C) NETWORK DEVICES SECTION (Table + Line Chart)
+    ###########################################################################
+    report_progress(progress, 30, "Network devices section")
+    story.append(Paragraph("Network Devices Section", styles["Heading2"]))
+    add_unavailable_notice(story, styles, api_response, ["network_issues", "problem_history"])
+
+    network_table_data = [["Last problem", "Host", "Problem", "Count"]] + api_response["network_issues"]
+    t_network = Table(
+        network_table_data,
+        colWidths=[doc.width*0.25, doc.width*0.25, doc.width*0.3, doc.width*0.2]
+    )
+    t_network.setStyle(TABLE_STYLE)
+    story.append(t_network)
+    story.append(Spacer(1, 0.3*inch))
+
+    # Render Problem History in the chart process pool
+    problem_chart = charts.submit(render_line_chart, index=slots, series=fit_slots(api_response["problem_history"], slots),
+                                  title="Problem History", xlabel=spec.xlabel, ylabel="Count",
+                                  y_axis=spec.problem_history_axis)
+    story.append(Paragraph("Problem History", styles["Heading3"]))
+    story.append(charts.image(problem_chart, width=5*inch, height=3*inch))
+    story.append(Spacer(1, 0.5*inch))
+
+    # ------------------------------------------------------------------------
+    # D) OPERATING SYSTEMS SECTION (Table + Line Chart)
+    # ------------------------------------------------------------------------
+    report_progress(progress, 45, "Operating systems section")
+    story.append(Paragraph("Operating Systems Section", styles["Heading2"]))
+    add_unavailable_notice(story, styles, api_response, ["os_issues", "cpu_usage"])
+
+    os_data = [["Time", "Host", "Problem", "Duration"]] + api_response["os_issues"]
+    t_os = Table(
+        os_data,
+        colWidths=[doc.width * 0.25, doc.width * 0.25, doc.width * 0.3, doc.width * 0.2]
+    )
+    t_os.setStyle(TABLE_STYLE)
+    story.append(t_os)
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Render CPU Load Over Time in the chart process pool
+    cpu_chart = charts.submit(render_line_chart, index=slots, series=fit_slots(api_response["cpu_usage"], slots),
+                              title="CPU Load Over Time", xlabel=spec.xlabel, ylabel="CPU Usage (%)", y_axis="percent")
+    story.append(Paragraph("CPU Load Over Time", styles["Heading3"]))
+    story.append(charts.image(cpu_chart, width=5 * inch, height=3 * inch))
+    story.append(Spacer(1, 0.5 * inch))
+
+    # ------------------------------------------------------------------------
+    # E) WEB APPLICATION SECTION (Table + Bar Chart)
+    # ------------------------------------------------------------------------
+    report_progress(progress, 60, "Web application section")
+    story.append(Paragraph("Web Application Section", styles["Heading2"]))
+    add_unavailable_notice(story, styles, api_response, ["web_issues", "web_downtime"])
+
+    web_data = [["Time", "Host", "Status", "Message"]] + api_response["web_issues"]
+    t_web = Table(
+        web_data,
+        colWidths=[doc.width * 0.25, doc.width * 0.25, doc.width * 0.2, doc.width * 0.3]
+    )
+    t_web.setStyle(TABLE_STYLE)
+    story.append(t_web)
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Render Web Downtime (bars per website) in the chart process pool
+    web_downtime_chart = charts.submit(render_bar_chart, index=slots, series=fit_slots(api_response["web_downtime"], slots),
+                                       title="Web Downtime", xlabel="Time Slot", ylabel="Downtime (minutes)",
+                                       colors_list=BAR_COLORS, figsize=(8, 5), dpi=150)
+    story.append(Paragraph("Web Downtime", styles["Heading3"]))
+    story.append(charts.image(web_downtime_chart, width=5 * inch, height=3 * inch))
+    story.append(Spacer(1, 0.5 * inch))
+
+    # ------------------------------------------------------------------------
+    # F) INCIDENT SUMMARY BY CATEGORY (Table + Pie Chart)
+    # ------------------------------------------------------------------------
+    report_progress(progress, 70, "Incident summary")
+    story.append(Paragraph("Incident Summary by Category", styles["Heading2"]))
+    add_unavailable_notice(story, styles, api_response, ["count_problem", "count_server", "count_web"])
+
+    incident_summary_data = api_response["incident_summary"]
+    incident_summary_table_data = [
+        ["Category", "Incident Count"],  # Table Headers
+    ] + [[key, value] for key, value in incident_summary_data.items()]
+    t_incident_summary = Table(
+        incident_summary_table_data,
+        colWidths=[doc.width * 0.5, doc.width * 0.5]  # Two equal columns
+    )
+    t_incident_summary.setStyle(TABLE_STYLE)
+    story.append(t_incident_summary)
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Render the pie chart in the chart process pool
+    incident_chart = charts.submit(render_pie_chart, values=incident_summary_data,
+                                   title="Issue Count by Section", colors_list=PIE_COLORS, figsize=(4, 4), dpi=150)
+    story.append(Paragraph("Issue Count by Section", styles["Heading3"]))
+    story.append(charts.image(incident_chart, width=3 * inch, height=2 * inch))
+    story.append(Spacer(1, 0.5 * inch))
+
+    # ------------------------------------------------------------------------
+    # G) THREATS DETECTED SECTION (Table + Line Chart)
+    # ------------------------------------------------------------------------
+    report_progress(progress, 80, "Threats section")
+    story.append(Paragraph("Threats Detected", styles["Heading2"]))
+    add_unavailable_notice(story, styles, api_response, ["threats_detected", "threats_history"])
+
+    threats_table_data = [["Time", "Categories of Cyber Threats", "Count"]] + api_response["threats_detected"]
+    t_threats = Table(
+        threats_table_data,
+        colWidths=[doc.width * 0.25, doc.width * 0.5, doc.width * 0.25]
+    )
+    t_threats.setStyle(TABLE_STYLE)
+    story.append(t_threats)
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Render Threats History in the chart process pool
+    threats_chart = charts.submit(render_line_chart, index=slots, series=fit_slots(api_response["threats_history"], slots),
+                                  title="Threats History", xlabel=spec.xlabel, ylabel="Count", y_axis="count")
+    story.append(Paragraph("Threats History", styles["Heading3"]))
+    story.append(charts.image(threats_chart, width=5 * inch, height=3 * inch))
+    story.append(Spacer(1, 0.5 * inch))
+
+    charts.wait()  # Resolve every chart (and any inline fallback) before layout
+    report_progress(progress, 90, "Rendering PDF")
+    doc.build(story) #Build the PDF
+    return window
@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from database import SessionLocal
+from event_bus import event_bus
+from models import ReportFile
+from report_catalog import update_report
+
+# Report builds running at once. Builds share no files or global state (charts
+# render in memory, in the chart process pool), so they can overlap; most of a
+# build is spent waiting on the data sources, which share the collector pool.
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix="report-job")
+
+
+def report_progress(progress, percent, stage):
+    """Call a builder's optional progress callback."""
+    if progress is not None:
+        progress(percent, stage)
+
+
+def _run(report_id, report_type, build, file_path, build_options):
+    update_report(report_id, stage="Starting")
+
+    def progress(percent, stage):
+        update_report(report_id, progress=percent, stage=stage)
+
+    try:
+        build(file_path, progress=progress, **build_options)
+    except Exception as e:
+        print(f"❌ Report job {report_id} failed: {e}")
+        event_bus.publish(f"Custom {report_type} report failed: {e}")
+        return
+
+    print(f"✅ Report job {report_id} finished: {file_path}")
+    event_bus.publish(f"Custom {report_type} report generated")
+
+
+def submit_report_job(report_id, report_type, build, file_path, **build_options):
+    """Queue `build(file_path, progress=..., **build_options)` on the report pool.
+
+    The job is the catalog entry `report_id`: its status and progress live in
+    the report_files row, so every API worker can answer /report/jobs/{id}.
+    `build` must record the outcome in that row (see cataloged_build).
+    """
+    _executor.submit(_run, report_id, report_type, build, file_path, build_options)
+    return report_id
+
+
+def get_job(report_id):
+    """Status and progress of the report build, or None if there is no such catalog entry."""
+    with SessionLocal() as db:
+        entry = db.get(ReportFile, report_id)
+        if entry is None:
+            return None
+        return {
+            "job_id": entry.id,
+            "report_type": entry.report_type,
+            "status": entry.status,  # building / ready / failed (or deleted)
+            "progress": entry.progress,
+            "stage": entry.stage,
+            "file_path": entry.path,
+            "message": (f"{entry.source.capitalize()} {entry.report_type} report generated: {entry.path}"
+                        if entry.status == "ready" else None),
+            "error": entry.error,
+            "created_at": entry.created_at,
+        }
@@ -0,0 +1,156 @@
+import os
+import math
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+# Seconds after a window ends before it counts as closed (late events are still being ingested)
+REPORT_WINDOW_SETTLE_DELAY = int(os.getenv("REPORT_WINDOW_SETTLE_DELAY", "900"))
+
+
+def _midnight(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class Window:
+    """Reporting window [start, end) and the bucket edges of its chart slots.
+
+    `edges` always span the whole period (a daily report generated at 14:00
+    still has six 4-hour slots); `end` is where data stops.
+    """
+
+    def __init__(self, start, end, edges, labels, live=False):
+        self.start = start
+        self.end = end
+        self.edges = list(edges)
+        self.labels = list(labels)
+        self.live = live  # Cut off at "now": data may still arrive
+
+    @property
+    def time_from(self):
+        return int(self.start.timestamp())
+
+    @property
+    def time_till(self):
+        """Inclusive upper bound for Zabbix time_till filters."""
+        return int(self.end.timestamp()) - 1
+
+    @property
+    def edge_stamps(self):
+        return [int(edge.timestamp()) for edge in self.edges]
+
+    @property
+    def closed(self):
+        """True when the window ended at least REPORT_WINDOW_SETTLE_DELAY ago, so its data no longer changes."""
+        return not self.live and self.end + timedelta(seconds=REPORT_WINDOW_SETTLE_DELAY) <= datetime.now()
+
+    def bucket_index(self, timestamp):
+        """Slot of a unix timestamp, or None outside the window."""
+        stamps = self.edge_stamps
+        if timestamp < stamps[0] or timestamp >= stamps[-1]:
+            return None
+        return bisect_right(stamps, timestamp) - 1
+
+    @property
+    def period_seconds(self):
+        """Length of the whole period its slots span; the same for every part of a split window."""
+        return (self.edges[-1] - self.edges[0]).total_seconds()
+
+    def split_at_slot_edges(self):
+        """[(slot, part)]: one window per finished slot, then the running rest.
+
+        Finished slots keep the same key however far the window has run, so
+        each is cached once. `slot` is the first slot index a part covers.
+        None when no slot has finished yet.
+        """
+        finished = [i for i, edge in enumerate(self.edges) if self.start < edge < self.end]
+        if not finished:
+            return None
+        bounds = [self.start] + [self.edges[i] for i in finished] + [self.end]
+        parts = [(finished[0] - 1, Window(bounds[0], bounds[1], self.edges, self.labels))]
+        for n, slot in enumerate(finished):
+            live = self.live and n == len(finished) - 1
+            parts.append((slot, Window(bounds[n + 1], bounds[n + 2], self.edges, self.labels, live=live)))
+        return parts
+
+    def data_range(self):
+        return f"{self.start.strftime('%Y-%m-%d %H:%M')} -- {self.end.strftime('%Y-%m-%d %H:%M')} GMT+7"
+
+    def _key(self):
+        return (self.start, self.end, tuple(self.edges))
+
+    def __eq__(self, other):
+        return isinstance(other, Window) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"Window({self.start:%Y-%m-%d %H:%M} -> {self.end:%Y-%m-%d %H:%M}, {len(self.labels)} slots)"
+
+
+class PeriodSpec:
+    """What differs between report types: window length, slots, limits and titles."""
+
+    def __init__(self, name, title, days=1, bucket=timedelta(hours=4), label_format="%H:%M",
+                 xlabel="Time", calendar_month=False, server_issue_limit=1000, web_issue_limit=1000,
+                 threat_table_limit=10, threat_series_limit=3, threat_severities=None,
+                 problem_history_axis="count"):
+        self.name = name
+        self.title = title
+        self.days = days
+        self.bucket = bucket
+        self.label_format = label_format
+        self.xlabel = xlabel
+        self.calendar_month = calendar_month
+        self.server_issue_limit = server_issue_limit  # Newest server problems listed in the table
+        self.web_issue_limit = web_issue_limit  # Newest Uptime Kuma "Down" events listed in the table
+        self.threat_table_limit = threat_table_limit  # Top signatures in the threats table
+        self.threat_series_limit = threat_series_limit  # Top threat categories in the history chart
+        self.threat_severities = threat_severities  # Suricata alert.severity filter (None = all)
+        self.problem_history_axis = problem_history_axis  # y_axis of the Problem History chart
+
+    @classmethod
+    def last_days(cls, days, max_buckets=10):
+        """Custom range covering the last `days` calendar days (including the end day)."""
+        bucket_days = max(1, math.ceil(days / max_buckets))
+        return cls(f"last-{days}-days", f"Last {days} Days", days=days, bucket=timedelta(days=bucket_days),
+                   label_format="%m-%d", xlabel="Days")
+
+    def window(self, end=None):
+        """Window of the period that contains the moment just before `end` (default: now), cut off at `end`.
+
+        With `end` on a period boundary (the scheduled jobs pass their 00:00
+        fire time) the window is the whole period that just ended.
+        """
+        now = datetime.now()
+        live = end is None or end >= now
+        end = min(end or now, now)
+        last_moment = end - timedelta(microseconds=1)
+
+        if self.calendar_month:
+            start = _midnight(last_moment).replace(day=1)
+            period_end = (start + timedelta(days=32)).replace(day=1)
+            # 5-day slots (01-05, 06-10, ...); the last one runs to the end of the month
+            edges = [start.replace(day=day) for day in (1, 6, 11, 16, 21, 26)] + [period_end]
+            labels = [f"{edges[i].day:02d}-{(edges[i + 1] - timedelta(days=1)).day:02d}" for i in range(len(edges) - 1)]
+        else:
+            start = _midnight(last_moment) - timedelta(days=self.days - 1)
+            period_end = start + timedelta(days=self.days)
+            edges = []
+            edge = start
+            while edge < period_end:
+                edges.append(edge)
+                edge += self.bucket
+            edges.append(period_end)
+            labels = [edge.strftime(self.label_format) for edge in edges[:-1]]
+
+        return Window(start, min(end, period_end), edges, labels, live=live and end < period_end)
+
+
+PERIODS = {
+    "daily": PeriodSpec("daily", "Daily", days=1, bucket=timedelta(hours=4), label_format="%H:%M",
+                        xlabel="Time", server_issue_limit=500, problem_history_axis="count_from_zero"),
+    "weekly": PeriodSpec("weekly", "Weekly", days=7, bucket=timedelta(days=1), label_format="%a %d",
+                         xlabel="Days", threat_severities=(2, 3)),
+    "monthly": PeriodSpec("monthly", "Monthly", calendar_month=True, xlabel="Days"),
+}
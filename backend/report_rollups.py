@@ -0,0 +1,122 @@
+import os
+from datetime import timedelta
+
+from database import SessionLocal
+from models import ProblemHourly, DowntimeHourly, AlertHourly, CpuHourly, RollupState
+
+# Windows of periods longer than this (seconds) are read from the hourly rollups when they cover them
+REPORT_ROLLUP_MIN_WINDOW = int(os.getenv("REPORT_ROLLUP_MIN_WINDOW", str(2 * 86400)))
+REPORT_ROLLUPS_ENABLED = os.getenv("REPORT_ROLLUPS_ENABLED", "true").lower() == "true"
+
+# "suricata_alerts" was "alerts" while only severities 1-3 were stored; the new
+# name makes existing installations backfill every severity
+ROLLUP_SOURCES = ("problems", "downtime", "suricata_alerts", "cpu")
+
+
+def _on_hour(moment):
+    return moment.minute == 0 and moment.second == 0 and moment.microsecond == 0
+
+
+def covers(source, window):
+    """True when the rollups of `source` hold the whole window.
+
+    Only long, hour-aligned windows qualify; anything else (or a database
+    error) makes the caller query the upstream as before.
+    """
+    if not REPORT_ROLLUPS_ENABLED:
+        return False
+    if not (_on_hour(window.start) and _on_hour(window.end)):
+        return False
+    # The period, not the window, decides: the slots of a split live window read like the whole
+    if window.period_seconds <= REPORT_ROLLUP_MIN_WINDOW:
+        return False
+    try:
+        with SessionLocal() as db:
+            state = db.get(RollupState, source)
+    except Exception as e:
+        print(f"⚠️ Rollup state unavailable, querying upstream: {e}")
+        return False
+    return state is not None and state.rolled_from <= window.start and state.rolled_until >= window.end
+
+
+def read_problems(window, group_name):
+    """(host, problem, count, last_clock, hour) rows of a host group in the window."""
+    with SessionLocal() as db:
+        return db.query(
+            ProblemHourly.host, ProblemHourly.problem, ProblemHourly.count,
+            ProblemHourly.last_clock, ProblemHourly.hour,
+        ).filter(
+            ProblemHourly.group_name == group_name,
+            ProblemHourly.hour >= window.start,
+            ProblemHourly.hour < window.end,
+        ).all()
+
+
+def read_downtime(window):
+    """(monitor, count, hour) rows in the window."""
+    with SessionLocal() as db:
+        return db.query(DowntimeHourly.monitor, DowntimeHourly.count, DowntimeHourly.hour).filter(
+            DowntimeHourly.hour >= window.start,
+            DowntimeHourly.hour < window.end,
+        ).all()
+
+
+def read_alerts(window, severities=None):
+    """(signature, signature_id, count, last_hit, hour) rows in the window."""
+    with SessionLocal() as db:
+        query = db.query(
+            AlertHourly.signature, AlertHourly.signature_id, AlertHourly.count,
+            AlertHourly.last_hit, AlertHourly.hour,
+        ).filter(
+            AlertHourly.hour >= window.start,
+            AlertHourly.hour < window.end,
+        )
+        if severities:
+            query = query.filter(AlertHourly.severity.in_(list(severities)))
+        return query.all()
+
+
+def read_cpu(window):
+    """(host, hour, value_min, value_avg, value_max) rows in the window, oldest first."""
+    with SessionLocal() as db:
+        return db.query(
+            CpuHourly.host, CpuHourly.hour, CpuHourly.value_min, CpuHourly.value_avg, CpuHourly.value_max,
+        ).filter(
+            CpuHourly.hour >= window.start,
+            CpuHourly.hour < window.end,
+        ).order_by(CpuHourly.hour).all()
+
+
+def get_rollup_state():
+    """{source: (rolled_from, rolled_until)} for every rollup source that has been ingested."""
+    with SessionLocal() as db:
+        return {state.source: (state.rolled_from, state.rolled_until) for state in db.query(RollupState).all()}
+
+
+def replace_hours(db, model, start, end, rows):
+    """Swap the rows of [start, end) for a freshly computed set (re-ingestion is idempotent)."""
+    db.query(model).filter(model.hour >= start, model.hour < end).delete(synchronize_session=False)
+    if rows:
+        db.bulk_insert_mappings(model, rows)
+
+
+def mark_rolled(db, source, start, until):
+    state = db.get(RollupState, source)
+    if state is None:
+        db.add(RollupState(source=source, rolled_from=start, rolled_until=until))
+    elif until > state.rolled_until:
+        state.rolled_until = until
+
+
+def hour_floor(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def hourly_edges(start, end):
+    edges = []
+    edge = start
+    while edge < end:
+        edges.append(edge)
+        edge += timedelta(hours=1)
+    edges.append(end)
+    return edges
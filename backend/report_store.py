@@ -0,0 +1,103 @@
+import os
+import json
+import hashlib
+import threading
+
+# On-disk store for source results of closed reporting windows (next to generated_reports/)
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", "report_cache")
+# Size limit of the store; least recently used entries are removed first
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+_lock = threading.Lock()
+_total_bytes = None  # Size of the store, scanned on first write
+
+
+def _path(key):
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(REPORT_CACHE_DIR, f"{digest}.json")
+
+
+def _entries():
+    """(mtime, size, path) of every stored entry."""
+    entries = []
+    try:
+        with os.scandir(REPORT_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def load(key):
+    """Stored value for `key`, or None when missing or unreadable."""
+    path = _path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        os.utime(path)  # Mark as recently used for eviction
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Report cache entry unreadable, ignoring it: {e}")
+        return None
+    # Guard against digest collisions
+    return stored["value"] if stored.get("key") == key else None
+
+
+def save(key, value):
+    """Store a JSON-serializable value, then evict old entries above REPORT_CACHE_MAX_BYTES."""
+    global _total_bytes
+    if REPORT_CACHE_MAX_BYTES <= 0:
+        return
+    path = _path(key)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+        data = json.dumps({"key": key, "value": value})
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # Readers never see a half-written entry
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️ Could not write report cache entry: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = sum(size for _, size, _ in _entries())
+        else:
+            _total_bytes += len(data)
+        if _total_bytes > REPORT_CACHE_MAX_BYTES:
+            _total_bytes = _evict()
+
+
+def _evict():
+    """Remove least recently used entries until the store is 10% under its limit."""
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    target = REPORT_CACHE_MAX_BYTES * 0.9
+    for _, size, path in entries:
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def clear():
+    """Remove every stored entry."""
+    global _total_bytes
+    with _lock:
+        for _, _, path in _entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        _total_bytes = 0
@@ -0,0 +1,173 @@
+import math
+
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib import colors
+
+# Native ReportLab drawings with the same arguments as the matplotlib renderers.
+# They are vector graphics in the PDF, so there is no rasterize/compress step.
+# figsize and dpi only apply to the PNG renderers and are ignored here.
+
+TITLE_FONT = "Helvetica-Bold"
+LABEL_FONT = "Helvetica"
+LINE_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
+
+
+def _drawing(width, height, title):
+    drawing = Drawing(width, height)
+    drawing.hAlign = "CENTER"  # Same placement as the PNG charts
+    drawing.add(String(width / 2, height - 14, title, fontName=TITLE_FONT, fontSize=12, textAnchor="middle"))
+    return drawing
+
+
+def _axis_titles(drawing, plot, xlabel, ylabel):
+    drawing.add(String(plot.x + plot.width / 2, plot.y - 28, xlabel, fontName=LABEL_FONT, fontSize=8, textAnchor="middle"))
+    # Rotate the y label 90° around its anchor
+    drawing.add(Group(String(0, 0, ylabel, fontName=LABEL_FONT, fontSize=8, textAnchor="middle"),
+                      transform=(0, 1, -1, 0, plot.x - 30, plot.y + plot.height / 2)))
+
+
+def _legend(drawing, x, y, pairs):
+    legend = Legend()
+    legend.x = x
+    legend.y = y
+    legend.alignment = "right"
+    legend.columnMaximum = 1
+    legend.fontName = LABEL_FONT
+    legend.fontSize = 7
+    legend.dxTextSpace = 4
+    legend.deltax = 80
+    legend.boxAnchor = "nw"
+    legend.colorNamePairs = pairs
+    drawing.add(legend)
+
+
+def _integer_axis(axis, max_value):
+    """Whole-number ticks starting at zero, about five of them."""
+    step = max(1, math.ceil(max_value / 5))
+    axis.valueMin = 0
+    axis.valueMax = max(step, math.ceil(max_value / step) * step)
+    axis.valueStep = step
+    axis.labelTextFormat = "%d"
+
+
+def _value_grid(axis):
+    axis.visibleGrid = 1
+    axis.gridStrokeColor = colors.lightgrey
+    axis.gridStrokeDashArray = (2, 2)
+    axis.labels.fontName = LABEL_FONT
+    axis.labels.fontSize = 7
+
+
+def _series_max(series):
+    return max([value for values in series.values() for value in values] or [0])
+
+
+def vector_line_chart(width, height, index, series, title, xlabel, ylabel,
+                      y_axis="count", colors_list=LINE_COLORS, figsize=None, dpi=None):
+    """One line per series; y_axis is "count", "count_from_zero" or "percent"."""
+    drawing = _drawing(width, height, title)
+    # Only as many lines as there are colors, like the PNG renderer
+    plotted = list(zip(series.items(), colors_list))
+
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 45, 55
+    chart.width, chart.height = width - 60, height - 80
+    chart.data = [list(values) for (_, values), _ in plotted] or [[0] * len(index)]
+    chart.categoryAxis.categoryNames = [str(label) for label in index]
+    chart.categoryAxis.labels.fontName = LABEL_FONT
+    chart.categoryAxis.labels.fontSize = 7
+    chart.joinedLines = 1
+
+    for i, (_, color) in enumerate(plotted):
+        chart.lines[i].strokeColor = colors.HexColor(color)
+        chart.lines[i].strokeWidth = 1.5
+        chart.lines[i].symbol = makeMarker("FilledCircle", size=3, fillColor=colors.HexColor(color))
+    if not plotted:
+        chart.lines[0].strokeColor = None  # Keep the axes for an empty chart
+
+    if y_axis == "percent":
+        chart.valueAxis.valueMin = 0  # Limit scale between 0% and 80%
+        chart.valueAxis.valueMax = 80
+        chart.valueAxis.valueStep = 10
+        chart.valueAxis.labelTextFormat = "%d%%"
+    else:
+        _integer_axis(chart.valueAxis, _series_max(dict((name, values) for (name, values), _ in plotted)))
+    _value_grid(chart.valueAxis)
+
+    drawing.add(chart)
+    _axis_titles(drawing, chart, xlabel, ylabel)
+    _legend(drawing, chart.x, 18, [(colors.HexColor(color), str(name)) for (name, _), color in plotted])
+    return drawing
+
+
+def vector_bar_chart(width, height, index, series, title, xlabel, ylabel,
+                     colors_list=None, figsize=None, dpi=None):
+    """Grouped bars, one color per series."""
+    drawing = _drawing(width, height, title)
+    colors_list = colors_list or LINE_COLORS
+    names = list(series.keys())
+
+    chart = VerticalBarChart()
+    chart.x, chart.y = 45, 55
+    chart.width, chart.height = width - 60, height - 80
+    chart.data = [list(series[name]) for name in names] or [[0] * len(index)]
+    chart.categoryAxis.categoryNames = [str(label) for label in index]
+    chart.categoryAxis.labels.fontName = LABEL_FONT
+    chart.categoryAxis.labels.fontSize = 7
+    chart.barSpacing = 1
+    chart.groupSpacing = 8
+
+    for i, name in enumerate(names):
+        chart.bars[i].fillColor = colors.HexColor(colors_list[i % len(colors_list)])
+        chart.bars[i].strokeColor = colors.black
+        chart.bars[i].strokeWidth = 0.5
+
+    _integer_axis(chart.valueAxis, _series_max(series))
+    _value_grid(chart.valueAxis)
+
+    drawing.add(chart)
+    _axis_titles(drawing, chart, xlabel, ylabel)
+    _legend(drawing, chart.x, 18, [(colors.HexColor(colors_list[i % len(colors_list)]), str(name))
+                                   for i, name in enumerate(names)])
+    return drawing
+
+
+def vector_pie_chart(width, height, values, title, colors_list=None, figsize=None, dpi=None):
+    """Pie of {label: value} with percentage labels."""
+    drawing = _drawing(width, height, title)
+    colors_list = colors_list or LINE_COLORS
+    total = sum(values.values())
+    if not total:
+        drawing.add(String(width / 2, height / 2, "No data", fontName=LABEL_FONT, fontSize=9, textAnchor="middle"))
+        return drawing
+
+    pie = Pie()
+    size = min(width, height) - 60
+    pie.x, pie.y = (width - size) / 2, (height - 20 - size) / 2
+    pie.width = pie.height = size
+    pie.data = list(values.values())
+    pie.labels = [f"{name} ({value / total * 100:.1f}%)" for name, value in values.items()]
+    pie.startAngle = 140
+    pie.direction = "anticlockwise"
+    pie.slices.strokeColor = colors.black
+    pie.slices.strokeWidth = 0.5
+    pie.slices.fontName = LABEL_FONT
+    pie.slices.fontSize = 6
+    for i in range(len(pie.data)):
+        pie.slices[i].fillColor = colors.HexColor(colors_list[i % len(colors_list)])
+
+    drawing.add(pie)
+    return drawing
+
+
+# PNG renderer name -> vector equivalent, used by ChartBatch(backend="vector")
+VECTOR_RENDERERS = {
+    "render_line_chart": vector_line_chart,
+    "render_bar_chart": vector_bar_chart,
+    "render_pie_chart": vector_pie_chart,
+}
@@ -0,0 +1,139 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+from database import SessionLocal
+from models import ProblemHourly, DowntimeHourly, AlertHourly, CpuHourly
+from report_periods import Window, REPORT_WINDOW_SETTLE_DELAY
+from report_rollups import (
+    ROLLUP_SOURCES, get_rollup_state, replace_hours, mark_rolled,
+    hour_floor, hourly_edges,
+)
+from reportSources.zabbix_source import NETWORK_GROUP, SERVER_GROUP, problem_events, require_group_id
+from reportSources.uptimekuma_source import query_web_downtime
+from reportSources.suricata_source import query_suricata_alerts_by_severity
+from zabbix_queries import get_group_hosts, get_cpu_itemids, fetch_cpu_trends
+
+# How often the rollups are brought up to date (seconds; job in scheduleReportAPI)
+REPORT_ROLLUP_INTERVAL = int(os.getenv("REPORT_ROLLUP_INTERVAL", "3600"))
+# History rolled up on the first run (covers last month's report)
+REPORT_ROLLUP_BACKFILL_DAYS = int(os.getenv("REPORT_ROLLUP_BACKFILL_DAYS", "35"))
+# Hours fetched from the upstreams per query
+REPORT_ROLLUP_CHUNK_HOURS = int(os.getenv("REPORT_ROLLUP_CHUNK_HOURS", "24"))
+# An hour is rolled up this many seconds after it ends, so late events are included;
+# never less than REPORT_WINDOW_SETTLE_DELAY because rolled-up hours are not re-ingested
+REPORT_ROLLUP_DELAY = max(int(os.getenv("REPORT_ROLLUP_DELAY", str(REPORT_WINDOW_SETTLE_DELAY))),
+                          REPORT_WINDOW_SETTLE_DELAY)
+
+_ingest_lock = threading.Lock()
+
+
+def _hourly_window(start, end):
+    edges = hourly_edges(start, end)
+    return Window(start, end, edges, [edge.strftime("%Y-%m-%d %H:00") for edge in edges[:-1]])
+
+
+def _problem_rows(window):
+    rows = {}
+    for group_name in (NETWORK_GROUP, SERVER_GROUP):
+        # Errors raise: the chunk and its watermark are retried instead of leaving a hole
+        group_id = require_group_id(group_name)
+        for issue in problem_events(group_id, window):
+            clock = int(issue["clock"])
+            host = issue["hosts"][0]["host"] if "hosts" in issue and issue["hosts"] else "Unknown"
+            problem = issue.get("name", "Unknown Issue")[:255]
+            hour = hour_floor(datetime.fromtimestamp(clock))
+            row = rows.setdefault((hour, group_name, host, problem), {
+                "hour": hour, "group_name": group_name, "host": host, "problem": problem,
+                "count": 0, "last_clock": clock,
+            })
+            row["count"] += 1
+            row["last_clock"] = max(row["last_clock"], clock)
+    return list(rows.values())
+
+
+def _downtime_rows(window):
+    rows = []
+    for monitor, counts in query_web_downtime(window).items():
+        for hour, count in zip(window.edges, counts):
+            if count:
+                rows.append({"hour": hour, "monitor": monitor, "count": count})
+    return rows
+
+
+def _alert_rows(window):
+    rows = []
+    # Every severity that occurs, so reports reading "all severities" match the upstream
+    for severity, alerts in query_suricata_alerts_by_severity(window).items():
+        for signature, sig_id, _, _, slots in alerts:
+            for hour, (count, last_hit) in zip(window.edges, slots):
+                if count:
+                    rows.append({"hour": hour, "signature_id": sig_id, "severity": severity,
+                                 "signature": signature, "count": count, "last_hit": last_hit})
+    return rows
+
+
+def _cpu_rows(window):
+    hosts = get_group_hosts(require_group_id(SERVER_GROUP))
+    host_items = get_cpu_itemids(list(hosts.keys()))
+    item_hosts = {item_id: hosts[host_id] for host_id, item_id in host_items.items() if item_id}
+
+    # Zabbix trends already are hourly min/avg/max
+    trends = fetch_cpu_trends(list(item_hosts.keys()), window.time_from, window.time_till)
+    rows = {}
+    for item_id, item_trends in trends.items():
+        for trend in item_trends:
+            hour = datetime.fromtimestamp(int(trend["clock"]))
+            rows[(hour, item_hosts[item_id])] = {
+                "hour": hour, "host": item_hosts[item_id],
+                "value_min": float(trend["value_min"]),
+                "value_avg": float(trend["value_avg"]),
+                "value_max": float(trend["value_max"]),
+            }
+    return list(rows.values())
+
+
+ROLLUPS = {
+    "problems": (ProblemHourly, _problem_rows),
+    "downtime": (DowntimeHourly, _downtime_rows),
+    "suricata_alerts": (AlertHourly, _alert_rows),
+    "cpu": (CpuHourly, _cpu_rows),
+}
+
+
+def ingest_rollups(now=None):
+    """Bring every hourly rollup up to the last finished hour.
+
+    Each source resumes from its own watermark (rollup_state) and is fetched
+    in chunks of REPORT_ROLLUP_CHUNK_HOURS; a chunk's rows and watermark are
+    committed together, so an interrupted run just resumes next time.
+    """
+    if not _ingest_lock.acquire(blocking=False):
+        print("Rollup ingestion already running, skipping this run")
+        return
+    try:
+        until = hour_floor((now or datetime.now()) - timedelta(seconds=REPORT_ROLLUP_DELAY))
+        state = get_rollup_state()
+        failed = []
+
+        for source in ROLLUP_SOURCES:
+            model, collect_rows = ROLLUPS[source]
+            _, rolled_until = state.get(source, (None, None))
+            start = rolled_until or hour_floor(until - timedelta(days=REPORT_ROLLUP_BACKFILL_DAYS))
+            while start < until:
+                end = min(start + timedelta(hours=REPORT_ROLLUP_CHUNK_HOURS), until)
+                try:
+                    rows = collect_rows(_hourly_window(start, end))
+                    with SessionLocal() as db:
+                        replace_hours(db, model, start, end, rows)
+                        mark_rolled(db, source, start, end)
+                        db.commit()
+                except Exception as e:
+                    print(f"⚠️ Rollup '{source}' failed for {start} -- {end}: {e}")
+                    failed.append(source)
+                    break  # Retry from the same hour on the next run
+                start = end
+        if not failed:
+            print(f"✅ Report rollups up to date until {until}")
+    finally:
+        _ingest_lock.release()
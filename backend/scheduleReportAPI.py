@@ -3,92 +3,223 @@ import datetime
 import os
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import text
 from dateutil.relativedelta import relativedelta
 import threading
+from functools import partial
 
-from monthly_report_generate import build_monthy_report
-from weekly_report_generate import build_report_weekly
-from daily_report_generate import build_report_daily
-from websocket_router import ws_manager
+from database import engine
+from report_engine import build_report
+from report_catalog import allocate_report_path, cataloged_build
+from report_rollups import REPORT_ROLLUPS_ENABLED
+from rollup_ingest import ingest_rollups, REPORT_ROLLUP_INTERVAL
+from event_bus import event_bus
 
 
-# Define the full absolute path to save the generated reports
-REPORTS_FOLDER_MONTHLY = os.path.join('generated_reports', 'schedule_report', 'monthly')
-REPORTS_FOLDER_WEEKLY = os.path.join('generated_reports', 'schedule_report', 'weekly')
-REPORTS_FOLDER_DAILY = os.path.join('generated_reports', 'schedule_report', 'daily')
-
 # FastAPI Router for Schedule Reports (No need for manual triggering)
 router = APIRouter(prefix="/report", tags=["report-schedule"])
 
-# Ensure the reports folder exists (create if it doesn't)
-for folder in [REPORTS_FOLDER_MONTHLY, REPORTS_FOLDER_WEEKLY, REPORTS_FOLDER_DAILY]:
-    if not os.path.exists(folder):
-        os.makedirs(folder)
+def build_schedule_report(report_type: str, schedule_report_name: str, end=None):
+    """Build a scheduled report under a unique, cataloged name and return its path.
+
+    `end` is where the report period stops (default: now).
+    """
+    report_id, unique_report_path = allocate_report_path("schedule", report_type, schedule_report_name, "scheduler")
+    print(f"Saving {report_type} report to: {unique_report_path}")
+    cataloged_build(report_id, partial(build_report, report_type))(unique_report_path, end=end)
+    return unique_report_path
+
+def scheduled_run_time(job_id: str, now=None):
+    """The run time a report job is executing for: its trigger's latest fire time up to now.
 
-# Helper function to generate unique report filename
-def get_unique_filename(base_path: str):
-    version = 1
-    file_path = base_path
-    while os.path.exists(file_path):
-        version += 1
-        file_path = f"{base_path.rsplit('.', 1)[0]}-{version}.pdf"
-    return file_path
+    Jobs are coalesced, so a run caught up after downtime (within
+    SCHEDULER_MISFIRE_GRACE_TIME) is the one for the most recent missed fire
+    time; its report must end there, not at the restart time.
+    Returns a naive local datetime like the report windows.
+    """
+    trigger = SCHEDULED_JOBS[job_id][1]
+    now = (now or datetime.datetime.now()).astimezone(trigger.timezone)
+    fire_time = None
+    candidate = trigger.get_next_fire_time(None, now - datetime.timedelta(days=32))
+    while candidate is not None and candidate <= now:
+        fire_time = candidate
+        candidate = trigger.get_next_fire_time(candidate, candidate + datetime.timedelta(microseconds=1))
+    return fire_time.replace(tzinfo=None)
 
 # Schedule Reports (Triggered by APScheduler)
 def generate_daily_report():
-    today = str(datetime.date.today())
-    schedule_report_name = f"schedule-{today}-Monitoring_Report.pdf"
-    report_path = os.path.join(REPORTS_FOLDER_DAILY, schedule_report_name)
-    unique_report_path = get_unique_filename(report_path)
-    print(f"Saving daily report to: {unique_report_path}")
-    build_report_daily(unique_report_path)
-    # Notify WebSocket clients
-    ws_manager.send_notification(f"Daily Report generated successfully")
+    # End the report at the 00:00 fire time so it covers the day that just ended
+    end = scheduled_run_time("daily_report")
+    schedule_report_name = f"schedule-{end.date()}-Monitoring_Report.pdf"
+    build_schedule_report("daily", schedule_report_name, end=end)
+    # Notify WebSocket clients (runs in an APScheduler thread, so go through the event bus)
+    event_bus.publish(f"Daily Report generated successfully")
 
 def generate_weekly_report():
-    today = str(datetime.date.today())
-    schedule_report_name = f"schedule-{today}-Weekly-Monitoring_Report.pdf"
-    report_path = os.path.join(REPORTS_FOLDER_WEEKLY, schedule_report_name)
-    unique_report_path = get_unique_filename(report_path)
-    print(f"Saving weekly report to: {unique_report_path}")
-    build_report_weekly(unique_report_path)
-    # Notify WebSocket clients
-    ws_manager.send_notification(f"Weekly Report generated successfully")
+    # Sunday 00:00: the Sunday-to-Saturday week that just ended
+    end = scheduled_run_time("weekly_report")
+    schedule_report_name = f"schedule-{end.date()}-Weekly-Monitoring_Report.pdf"
+    build_schedule_report("weekly", schedule_report_name, end=end)
+    # Notify WebSocket clients (runs in an APScheduler thread, so go through the event bus)
+    event_bus.publish(f"Weekly Report generated successfully")
 
 def generate_monthly_report():
-    today = str(datetime.date.today())
-    schedule_report_name = f"schedule-{today}-monthly-Monitoring_Report.pdf"
-    report_path = os.path.join(REPORTS_FOLDER_MONTHLY, schedule_report_name)
-    unique_report_path = get_unique_filename(report_path)
-    print(f"Saving monthly report to: {unique_report_path}")
-    build_monthy_report(unique_report_path)
-    # Notify WebSocket clients
-    ws_manager.send_notification(f"Monthly Report generated successfully")
+    # 00:00 on the 1st: the month that just ended
+    end = scheduled_run_time("monthly_report")
+    schedule_report_name = f"schedule-{end.date()}-monthly-Monitoring_Report.pdf"
+    build_schedule_report("monthly", schedule_report_name, end=end)
+    # Notify WebSocket clients (runs in an APScheduler thread, so go through the event bus)
+    event_bus.publish(f"Monthly Report generated successfully")
+
+# ---------------------------------------------------------------------------
+# Scheduler: jobs persist in PostgreSQL and only the node holding the
+# advisory lock runs them, so extra uvicorn workers or replicas stay idle.
+# ---------------------------------------------------------------------------
+
+# pg_try_advisory_lock key shared by every API process
+SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", "724311"))
+# Seconds between leadership attempts (standby) and lock health checks (leader)
+SCHEDULER_LEADER_CHECK = int(os.getenv("SCHEDULER_LEADER_CHECK", "30"))
+# A run missed by up to this many seconds (e.g. restart over midnight) still happens once
+SCHEDULER_MISFIRE_GRACE_TIME = int(os.getenv("SCHEDULER_MISFIRE_GRACE_TIME", str(6 * 3600)))
+
+SCHEDULED_JOBS = {
+    # Every day at midnight
+    "daily_report": (generate_daily_report, CronTrigger(hour=0, minute=0)),
+    # Every Sunday at midnight
+    "weekly_report": (generate_weekly_report, CronTrigger(day_of_week='sun', hour=0, minute=0)),
+    # Every 1st of the month at midnight
+    "monthly_report": (generate_monthly_report, CronTrigger(day=1, hour=0, minute=0)),
+    # Hourly rollups for weekly/monthly reports
+    "report_rollups": (ingest_rollups, IntervalTrigger(seconds=REPORT_ROLLUP_INTERVAL)),
+}
+
+_scheduler = None
+_leader_connection = None
+_leader_thread = None
+_stop_leader = threading.Event()
+
+
+def _try_become_leader():
+    """Take the advisory lock on a dedicated connection; it is held while the connection lives."""
+    global _leader_connection
+    # AUTOCOMMIT: otherwise the connection sits "idle in transaction" for as long as it leads
+    connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SCHEDULER_LOCK_KEY}).scalar()
+    except Exception:
+        connection.close()
+        raise
+    if not acquired:
+        connection.close()  # No lock held: the connection can go back to the pool
+        return False
+    _leader_connection = connection
+    return True
+
+
+def _still_leader():
+    try:
+        _leader_connection.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        print(f"⚠️ Scheduler lock connection lost: {e}")
+        return False
+
+
+def _start_jobs():
+    """Start the persistent scheduler and register jobs that are not stored yet."""
+    global _scheduler
+    _scheduler = BackgroundScheduler(
+        jobstores={"default": SQLAlchemyJobStore(engine=engine, tablename="apscheduler_jobs")},
+        job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": SCHEDULER_MISFIRE_GRACE_TIME},
+    )
+    # Paused first: stored jobs keep their next run time, so runs missed while down are caught up on resume
+    _scheduler.start(paused=True)
+    for job_id, (func, trigger) in SCHEDULED_JOBS.items():
+        job = _scheduler.get_job(job_id)
+        if job is None:
+            _scheduler.add_job(func, trigger, id=job_id, name=job_id)
+        elif str(job.trigger) != str(trigger):
+            _scheduler.reschedule_job(job_id, trigger=trigger)
+    if REPORT_ROLLUPS_ENABLED:
+        _scheduler.modify_job("report_rollups", next_run_time=datetime.datetime.now())  # Catch up right away
+    else:
+        _scheduler.pause_job("report_rollups")
+    _scheduler.resume()
+    print("Scheduler started (leader)")
+
+
+def _stop_jobs():
+    global _scheduler, _leader_connection
+    if _scheduler is not None:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
+    if _leader_connection is not None:
+        _release_leader_connection(_leader_connection)
+        _leader_connection = None
+
+
+def _release_leader_connection(connection):
+    """Unlock and discard the lock connection.
+
+    close() alone would return it to the pool with the session-level lock
+    still held, so neither this process nor any other could lead again.
+    invalidate() closes the DBAPI connection, which ends the session (and
+    the lock) even if the unlock fails.
+    """
+    try:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEDULER_LOCK_KEY})
+    except Exception as e:
+        print(f"⚠️ Scheduler lock unlock failed, dropping the connection: {e}")
+    try:
+        connection.invalidate()
+        connection.close()
+    except Exception:
+        pass
+
+
+def _leader_loop():
+    while not _stop_leader.is_set():
+        try:
+            if _scheduler is None:
+                if _try_become_leader():
+                    _start_jobs()
+            elif not _still_leader():
+                print("Scheduler lost leadership, standing by")
+                _stop_jobs()
+        except Exception as e:
+            print(f"⚠️ Scheduler leader election failed: {e}")
+            _stop_jobs()
+        _stop_leader.wait(SCHEDULER_LEADER_CHECK)
+    _stop_jobs()
+
 
-# Set up scheduler to run daily, weekly, and monthly tasks using Cron triggers
 def start_scheduler():
-    scheduler = BackgroundScheduler()
-    
-    # Cron trigger for daily report at midnight
-    scheduler.add_job(generate_daily_report, 'cron', hour=0, minute=0)  # Every day at midnight
-    
-    # Cron trigger for weekly report every Sunday at midnight
-    scheduler.add_job(generate_weekly_report, 'cron', day_of_week='sun', hour=0, minute=0)  # Every Sunday at midnight
-    
-    # Cron trigger for monthly report on the 1st of the month at midnight
-    scheduler.add_job(generate_monthly_report, 'cron', day=1, hour=0, minute=0)  # Every 1st of the month at midnight
-    
-    scheduler.start()
-    
-    print("Scheduler started")
+    """Join the leader election (idempotent); called once at app startup."""
+    global _leader_thread
+    if _leader_thread is not None and _leader_thread.is_alive():
+        return
+    _stop_leader.clear()
+    _leader_thread = threading.Thread(target=_leader_loop, name="report-scheduler", daemon=True)
+    _leader_thread.start()
 
-# Endpoint to manually start the scheduler
+
+def stop_scheduler():
+    _stop_leader.set()
+
+
+def scheduler_status():
+    return "leader" if _scheduler is not None else "standby"
+
+# Endpoint kept for the UI: the scheduler now starts with the app
 @router.post("/start-scheduler")
 async def start_scheduler_endpoint():
     try:
-        # Run the scheduler in a separate thread to avoid blocking FastAPI startup
-        threading.Thread(target=start_scheduler, daemon=True).start()
-        return {"message": "Scheduler started in the background"}
+        start_scheduler()
+        return {"message": f"Scheduler running ({scheduler_status()})"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start scheduler: {str(e)}")
 
@@ -122,39 +253,30 @@ async def get_next_schedule():
         "next_monthly_report": next_monthly_report_time,
     }
 
-# Schedule Reports (Triggered by APScheduler)
+# Manual runs; plain def so FastAPI builds them in its threadpool, off the event loop
 @router.get("/generate_daily_report_API")
-async def generate_daily_report_API():
+def generate_daily_report_API():
     today = str(datetime.date.today())
     schedule_report_name = f"schedule-{today}-Monitoring_Report.pdf"
-    report_path = os.path.join(REPORTS_FOLDER_DAILY, schedule_report_name)
-    unique_report_path = get_unique_filename(report_path)
-    print(f"Saving daily report to: {unique_report_path}")
-    build_report_daily(unique_report_path)
+    unique_report_path = build_schedule_report("daily", schedule_report_name)
     # Notify WebSocket clients
-    await ws_manager.send_notification(f"Daily Report generated successfully")
+    event_bus.publish(f"Daily Report generated successfully")
     return(f"Daily Report generated successfully: {unique_report_path}")
 
 @router.get("/generate_weekly_report_API")
-async def generate_weekly_report_API():
+def generate_weekly_report_API():
     today = str(datetime.date.today())
     schedule_report_name = f"schedule-{today}-Weekly-Monitoring_Report.pdf"
-    report_path = os.path.join(REPORTS_FOLDER_WEEKLY, schedule_report_name)
-    unique_report_path = get_unique_filename(report_path)
-    print(f"Saving weekly report to: {unique_report_path}")
-    build_report_weekly(unique_report_path)
+    unique_report_path = build_schedule_report("weekly", schedule_report_name)
     # Notify WebSocket clients
-    await ws_manager.send_notification(f"Weekly Report generated successfully")
+    event_bus.publish(f"Weekly Report generated successfully")
     return(f"Weekly Report generated successfully: {unique_report_path}")
 
 @router.get("/generate_monthly_report_API")
-async def generate_monthly_report_API():
+def generate_monthly_report_API():
     today = str(datetime.date.today())
     schedule_report_name = f"schedule-{today}-monthly-Monitoring_Report.pdf"
-    report_path = os.path.join(REPORTS_FOLDER_MONTHLY, schedule_report_name)
-    unique_report_path = get_unique_filename(report_path)
-    print(f"Saving monthly report to: {unique_report_path}")
-    build_monthy_report(unique_report_path)
+    unique_report_path = build_schedule_report("monthly", schedule_report_name)
     # Notify WebSocket clients
-    await ws_manager.send_notification(f"Monthly Report generated successfully")
+    event_bus.publish(f"Monthly Report generated successfully")
     return(f"Monthly Report generated successfully: {unique_report_path}")
\ No newline at end of file
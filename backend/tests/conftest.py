@@ -0,0 +1,27 @@
+import os
+import tempfile
+
+import pytest
+
+# Never touch PostgreSQL: the catalog and rollup models run on a throwaway SQLite file
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/tests.db"
+
+import report_cache
+import report_store
+from database import Base, engine
+import models  # noqa: F401  (registers the tables)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Empty closed-window cache (memory and disk) in a temporary directory."""
+    monkeypatch.setattr(report_store, "REPORT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(report_store, "_total_bytes", None)
+    report_cache._window_cache.clear()
+    yield tmp_path
+    report_cache._window_cache.clear()
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from cpu_resample import resample_hosts
+
+EDGES = [0, 100, 200, 300]
+
+
+def series(clocks, values):
+    return np.asarray(clocks, dtype=np.int64), np.asarray(values, dtype=np.float64)
+
+
+def test_p95_is_the_nearest_rank_per_slot():
+    values = list(range(1, 21))  # 20 samples in slot 0: rank ceil(0.95 * 20) = 19
+    hosts = {"srv1": series([i * 5 for i in range(20)], values)}
+    assert resample_hosts(hosts, EDGES, how="p95") == {"srv1": [19, 0, 0]}
+
+
+def test_p95_of_a_single_sample_is_the_sample():
+    hosts = {"srv1": series([150], [42.0])}
+    assert resample_hosts(hosts, EDGES, how="p95") == {"srv1": [0, 42, 0]}
+
+
+def test_p95_does_not_mix_hosts_or_slots():
+    hosts = {
+        "srv1": series([10, 20, 110, 120], [90, 10, 5, 7]),
+        "srv2": series([210, 220, 230], [60, 80, 70]),
+    }
+    assert resample_hosts(hosts, EDGES, how="p95") == {"srv1": [90, 7, 0], "srv2": [0, 0, 80]}
+
+
+@pytest.mark.parametrize("how, expected", [("mean", [20, 0, 50]), ("max", [30, 0, 50])])
+def test_mean_and_max(how, expected):
+    hosts = {"srv1": series([0, 99, 200, 300], [10, 30, 50, 99])}  # 300 is past the last edge
+    assert resample_hosts(hosts, EDGES, how=how) == {"srv1": expected}
+
+
+def test_unknown_aggregation_raises():
+    with pytest.raises(ValueError):
+        resample_hosts({"srv1": series([0], [1])}, EDGES, how="median")
@@ -0,0 +1,40 @@
+import asyncio
+
+from event_bus import EventBus
+
+
+def deliveries(publish):
+    """Frames a bus bound to a fresh loop delivers after `publish(bus)`."""
+    frames = []
+
+    async def run():
+        bus = EventBus()
+        bus.subscribe(frames.append)
+        bus.bind(asyncio.get_running_loop())
+        publish(bus)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    return frames
+
+
+def test_relayed_messages_come_back_through_publish_local():
+    relayed = []
+
+    def publish(bus):
+        bus.set_relay(lambda message: (relayed.append(message), bus.publish_local(message)))
+        bus.publish("Daily Report generated successfully")
+
+    assert deliveries(publish) == ["Daily Report generated successfully"]
+    assert relayed == ["Daily Report generated successfully"]
+
+
+def test_failed_relay_still_notifies_this_process():
+    def broken(message):
+        raise ConnectionError("database is down")
+
+    def publish(bus):
+        bus.set_relay(broken)
+        bus.publish("Weekly Report generated successfully")
+
+    assert deliveries(publish) == ["Weekly Report generated successfully"]
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import report_periods
+from report_cache import memoize_closed_window, split_live_window, add_series
+from report_periods import PERIODS
+
+
+def freeze(monkeypatch, now):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    monkeypatch.setattr(report_periods, "datetime", FrozenDatetime)
+
+
+@pytest.fixture
+def counted_source(cache_dir):
+    """A cached, split source counting one event per hour; records every upstream query."""
+    queries = []
+
+    @split_live_window(lambda done, part, slot: add_series(done, part))
+    @memoize_closed_window
+    def source(window):
+        queries.append((window.start, window.end))
+        counts = [0] * len(window.labels)
+        hour = window.start
+        while hour < window.end:
+            counts[window.bucket_index(int(hour.timestamp()))] += 1
+            hour += timedelta(hours=1)
+        return {"events": counts}
+
+    return source, queries
+
+
+def test_live_window_queries_each_finished_slot_once(counted_source, monkeypatch):
+    source, queries = counted_source
+    day = datetime(2026, 10, 17)
+
+    freeze(monkeypatch, day + timedelta(hours=10, minutes=30))
+    assert source(PERIODS["daily"].window()) == {"events": [4, 4, 3, 0, 0, 0]}
+    assert queries == [
+        (day, day + timedelta(hours=4)),
+        (day + timedelta(hours=4), day + timedelta(hours=8)),
+        (day + timedelta(hours=8), day + timedelta(hours=10, minutes=30)),
+    ]
+
+    # Later build: the finished slots come from the cache, only new ones are queried
+    queries.clear()
+    freeze(monkeypatch, day + timedelta(hours=14, minutes=30))
+    assert source(PERIODS["daily"].window()) == {"events": [4, 4, 4, 3, 0, 0]}
+    assert queries == [
+        (day + timedelta(hours=8), day + timedelta(hours=12)),
+        (day + timedelta(hours=12), day + timedelta(hours=14, minutes=30)),
+    ]
+
+
+def test_split_result_matches_the_whole_window(counted_source, monkeypatch):
+    source, _ = counted_source
+    day = datetime(2026, 10, 17)
+    freeze(monkeypatch, day + timedelta(days=1, hours=2))
+    whole = source(PERIODS["daily"].window(end=day + timedelta(hours=14, minutes=30)))
+    freeze(monkeypatch, day + timedelta(hours=14, minutes=30))
+    assert source(PERIODS["daily"].window()) == whole
+
+
+def test_window_before_the_first_edge_is_not_split(monkeypatch):
+    freeze(monkeypatch, datetime(2026, 10, 17, 3, 0))
+    assert PERIODS["daily"].window().split_at_slot_edges() is None
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+import report_catalog
+import report_jobs
+from database import SessionLocal
+from models import ReportFile
+
+
+@pytest.fixture
+def reports_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with SessionLocal() as db:
+        db.query(ReportFile).delete()
+        db.commit()
+    return tmp_path
+
+
+def test_allocate_versions_taken_names(reports_dir):
+    paths = [report_catalog.allocate_report_path("custom", "daily", "Custom-2026-10-17.pdf")[1] for _ in range(3)]
+    folder = os.path.join("generated_reports", "custom_report", "daily")
+    assert paths == [
+        os.path.join(folder, "Custom-2026-10-17.pdf"),
+        os.path.join(folder, "Custom-2026-10-17-2.pdf"),
+        os.path.join(folder, "Custom-2026-10-17-3.pdf"),
+    ]
+
+
+def test_allocate_skips_files_that_predate_the_catalog(reports_dir):
+    folder = report_catalog.report_folder("schedule", "weekly")
+    os.makedirs(folder)
+    open(os.path.join(folder, "w.pdf"), "wb").close()
+    _, path = report_catalog.allocate_report_path("schedule", "weekly", "w.pdf", "scheduler")
+    assert path == os.path.join(folder, "w-2.pdf")
+
+
+def test_deleted_names_are_never_reused(reports_dir):
+    report_id, path = report_catalog.allocate_report_path("custom", "monthly", "m.pdf")
+    with SessionLocal() as db:
+        report_catalog.mark_deleted(db, db.get(ReportFile, report_id))
+    assert report_catalog.allocate_report_path("custom", "monthly", "m.pdf")[1].endswith("m-2.pdf")
+
+
+def test_cataloged_build_records_the_outcome(reports_dir):
+    report_id, path = report_catalog.allocate_report_path("custom", "daily", "d.pdf", "alice")
+
+    def build(file_path, **options):
+        with open(file_path, "wb") as f:
+            f.write(b"%PDF-1.4")
+
+    report_catalog.cataloged_build(report_id, build)(path)
+    with SessionLocal() as db:
+        entry = db.get(ReportFile, report_id)
+        assert (entry.status, entry.size_bytes, entry.created_by) == ("ready", 8, "alice")
+        assert len(entry.checksum) == 64
+        assert report_catalog.file_names(db, "custom")["daily"] == ["d.pdf"]
+
+
+def test_job_status_is_read_from_the_catalog_entry(reports_dir):
+    report_id, path = report_catalog.allocate_report_path("custom", "daily", "d.pdf")
+    assert report_jobs.get_job(report_id)["status"] == "building"
+
+    def build(file_path):
+        report_catalog.update_report(report_id, progress=50, stage="Halfway")
+        assert report_jobs.get_job(report_id)["progress"] == 50
+        raise RuntimeError("Zabbix is down")
+
+    with pytest.raises(RuntimeError):
+        report_catalog.cataloged_build(report_id, build)(path)
+    job = report_jobs.get_job(report_id)
+    assert (job["status"], job["error"]) == ("failed", "Zabbix is down")
+    assert report_jobs.get_job(report_id + 1) is None
+
+
+def test_list_reports_searches_file_names(reports_dir):
+    for name in ("Custom-2026-10-17.pdf", "Custom-2026-10-16.pdf", "100%_done.pdf"):
+        report_catalog.allocate_report_path("custom", "daily", name)
+    with SessionLocal() as db:
+        found = report_catalog.list_reports(db, source="custom", search="custom-2026-10-17", page_size=1)
+        assert (found["total"], [item["file_name"] for item in found["items"]]) == (1, ["Custom-2026-10-17.pdf"])
+        assert report_catalog.list_reports(db, search="%")["total"] == 1  # Wildcards match literally
+
+
+def test_sync_skips_files_another_worker_added_meanwhile(reports_dir, monkeypatch):
+    folder = report_catalog.report_folder("schedule", "daily")
+    os.makedirs(folder)
+    for name in ("a.pdf", "b.pdf"):
+        open(os.path.join(folder, name), "wb").close()
+    checksum = report_catalog._checksum
+
+    def other_worker_first(path):
+        if path.endswith("a.pdf"):  # The other worker commits a.pdf after this one listed the catalog
+            with SessionLocal() as db:
+                db.add(ReportFile(source="schedule", report_type="daily", file_name="a.pdf", path=path))
+                db.commit()
+        return checksum(path)
+
+    monkeypatch.setattr(report_catalog, "_checksum", other_worker_first)
+    report_catalog.sync_catalog()
+    with SessionLocal() as db:
+        assert sorted(name for (name,) in db.query(ReportFile.file_name)) == ["a.pdf", "b.pdf"]
@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+
+from report_charts import render_bar_chart, render_line_chart
+
+
+def test_bar_chart_leaves_no_open_figure():
+    png = render_bar_chart(["Mon", "Tue"], {"up": [1, 2], "down": [2, 1]}, "Uptime", "Day", "Count")
+    assert png.startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
+
+
+def test_charts_rendered_in_parallel_threads_match_serial_renders():
+    specs = [dict(index=[1, 2, 3], series={f"s{n}": [n, n * 2, n * 3]}, title=f"Chart {n}",
+                  xlabel="x", ylabel="y") for n in range(6)]
+    serial = [render_line_chart(**spec) for spec in specs]
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        parallel = list(pool.map(lambda spec: render_line_chart(**spec), specs))
+    assert parallel == serial
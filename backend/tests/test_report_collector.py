@@ -0,0 +1,29 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import report_collector
+
+
+def test_source_stuck_in_the_queue_is_marked_unavailable(monkeypatch):
+    monkeypatch.setattr(report_collector, "_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(report_collector, "REPORT_SOURCE_QUEUE_TIMEOUT", 0.2)
+    release = threading.Event()
+    queued = []
+
+    def busy():
+        release.wait(5)
+        return "busy"
+
+    def waiting():
+        queued.append(True)
+        return "waiting"
+
+    try:
+        collected, unavailable = report_collector.collect_sources(
+            {"busy": busy, "waiting": waiting}, timeouts={"busy": 0.5})
+    finally:
+        release.set()
+
+    assert unavailable == {"busy", "waiting"}  # busy overran its own timeout
+    report_collector._executor.shutdown(wait=True)
+    assert queued == []  # The queued source was dropped, not run late
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import report_periods
+from report_periods import PERIODS
+
+# A Sunday and the 1st of the month: the daily, weekly and monthly jobs all fire
+FIRE_TIME = datetime(2026, 11, 1, 0, 0)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Freeze datetime.now() inside report_periods just after the jobs fired."""
+    now = FIRE_TIME + timedelta(seconds=3)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    monkeypatch.setattr(report_periods, "datetime", FrozenDatetime)
+    return now
+
+
+def test_scheduled_daily_covers_the_day_that_ended(frozen_now):
+    window = PERIODS["daily"].window(end=FIRE_TIME)
+    assert (window.start, window.end) == (datetime(2026, 10, 31), FIRE_TIME)
+    assert window.edges == [datetime(2026, 10, 31, hour) for hour in range(0, 24, 4)] + [FIRE_TIME]
+    assert window.labels == ["00:00", "04:00", "08:00", "12:00", "16:00", "20:00"]
+    assert not window.live
+
+
+def test_scheduled_weekly_covers_sunday_to_saturday(frozen_now):
+    window = PERIODS["weekly"].window(end=FIRE_TIME)
+    assert (window.start, window.end) == (datetime(2026, 10, 25), FIRE_TIME)
+    assert window.start.strftime("%a") == "Sun"
+    assert len(window.labels) == 7
+    assert not window.live
+
+
+def test_scheduled_monthly_covers_the_previous_month(frozen_now):
+    window = PERIODS["monthly"].window(end=FIRE_TIME)
+    assert (window.start, window.end) == (datetime(2026, 10, 1), FIRE_TIME)
+    assert window.labels == ["01-05", "06-10", "11-15", "16-20", "21-25", "26-31"]
+    assert not window.live
+
+
+def test_window_without_end_is_the_running_period(frozen_now):
+    # What a 00:00 job without `end` used to report: a few seconds of the new day
+    window = PERIODS["daily"].window()
+    assert (window.start, window.end) == (FIRE_TIME, frozen_now)
+    assert window.live
+
+
+def test_end_in_the_past_cuts_off_a_closed_window(frozen_now):
+    end = datetime(2026, 10, 15, 14, 0)
+    window = PERIODS["daily"].window(end=end)
+    assert (window.start, window.end) == (datetime(2026, 10, 15), end)
+    assert window.edges[-1] == datetime(2026, 10, 16)  # Slots still span the whole day
+    assert not window.live
+
+
+def test_end_in_the_future_is_clipped_to_now(frozen_now):
+    window = PERIODS["daily"].window(end=FIRE_TIME + timedelta(days=1))
+    assert window.end == frozen_now
+    assert window.live
+
+
+def test_window_is_closed_only_after_the_settle_delay(frozen_now, monkeypatch):
+    monkeypatch.setattr(report_periods, "REPORT_WINDOW_SETTLE_DELAY", 900)
+    window = PERIODS["daily"].window(end=FIRE_TIME)
+    assert not window.closed  # Ended 3 seconds ago: late events may still arrive
+    assert PERIODS["daily"].window(end=FIRE_TIME - timedelta(hours=1)).closed
+
+
+def test_bucket_index_is_half_open(frozen_now):
+    window = PERIODS["daily"].window(end=FIRE_TIME)
+    stamps = window.edge_stamps
+    assert window.bucket_index(stamps[0]) == 0
+    assert window.bucket_index(stamps[1] - 1) == 0
+    assert window.bucket_index(stamps[1]) == 1
+    assert window.bucket_index(stamps[-1] - 1) == 5
+    assert window.bucket_index(stamps[-1]) is None
+    assert window.bucket_index(stamps[0] - 1) is None
+
+
+def test_monthly_last_slot_runs_to_the_end_of_february(frozen_now):
+    window = PERIODS["monthly"].window(end=datetime(2026, 3, 1))
+    assert window.edges[-2:] == [datetime(2026, 2, 26), datetime(2026, 3, 1)]
+    assert window.labels[-1] == "26-28"
+
+
+def test_last_days_keeps_at_most_ten_slots(frozen_now):
+    window = report_periods.PeriodSpec.last_days(30).window(end=FIRE_TIME)
+    assert window.start == datetime(2026, 10, 2)
+    assert len(window.labels) == 10
+    assert window.edges[1] - window.edges[0] == timedelta(days=3)
+
+
+def test_split_at_slot_edges_gives_finished_slots_then_the_running_rest(frozen_now):
+    now = datetime(2026, 10, 31, 9, 15)
+    window = report_periods.Window(datetime(2026, 10, 31), now, PERIODS["daily"].window(end=FIRE_TIME).edges,
+                                   ["00:00", "04:00", "08:00", "12:00", "16:00", "20:00"], live=True)
+    parts = window.split_at_slot_edges()
+    assert [(slot, part.start.hour, part.end.hour, part.live) for slot, part in parts] == [
+        (0, 0, 4, False), (1, 4, 8, False), (2, 8, 9, True),
+    ]
+    assert all(part.edges == window.edges for _, part in parts)
@@ -0,0 +1,41 @@
+import os
+
+import report_store
+
+
+def test_round_trip(cache_dir):
+    report_store.save("k", {"a": [1, 2]})
+    assert report_store.load("k") == {"a": [1, 2]}
+    assert report_store.load("missing") is None
+
+
+def test_eviction_removes_least_recently_used_first(cache_dir, monkeypatch):
+    value = "x" * 1000
+    entry_size = len('{"key": "k0", "value": "%s"}' % value)
+    monkeypatch.setattr(report_store, "REPORT_CACHE_MAX_BYTES", entry_size * 3)
+
+    for n, key in enumerate(["k0", "k1", "k2"]):
+        report_store.save(key, value)
+        os.utime(report_store._path(key), (1000 + n, 1000 + n))
+    report_store.load("k0")  # Used again: now the most recent
+
+    report_store.save("k3", value)  # Over the limit: down to 90% of it
+
+    assert report_store.load("k1") is None
+    assert report_store.load("k2") is None
+    assert report_store.load("k0") == value
+    assert report_store.load("k3") == value
+    assert sum(size for _, size, _ in report_store._entries()) <= entry_size * 3 * 0.9
+
+
+def test_unreadable_entry_is_ignored(cache_dir):
+    report_store.save("k", [1])
+    with open(report_store._path("k"), "w") as f:
+        f.write("{not json")
+    assert report_store.load("k") is None
+
+
+def test_disabled_store_writes_nothing(cache_dir, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_CACHE_MAX_BYTES", 0)
+    report_store.save("k", [1])
+    assert report_store._entries() == []
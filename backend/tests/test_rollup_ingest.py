@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import rollup_ingest
+from database import SessionLocal
+from models import AlertHourly, RollupState
+from report_rollups import get_rollup_state
+
+NOW = datetime(2026, 10, 17, 12, 10)
+
+
+@pytest.fixture
+def upstreams(monkeypatch):
+    """Empty rollup tables and quiet upstreams; tests override the source they exercise."""
+    with SessionLocal() as db:
+        db.query(RollupState).delete()
+        db.query(AlertHourly).delete()
+        db.commit()
+    monkeypatch.setattr(rollup_ingest, "REPORT_ROLLUP_BACKFILL_DAYS", 1)
+    monkeypatch.setattr(rollup_ingest, "REPORT_ROLLUP_CHUNK_HOURS", 6)
+    monkeypatch.setattr(rollup_ingest, "ROLLUPS", {
+        "suricata_alerts": (AlertHourly, lambda window: []),
+    })
+    monkeypatch.setattr(rollup_ingest, "ROLLUP_SOURCES", ("suricata_alerts",))
+
+
+def test_failed_chunk_keeps_the_watermark(upstreams, monkeypatch):
+    calls = []
+
+    def rows(window):
+        calls.append(window.start)
+        if len(calls) == 2:
+            raise RuntimeError("Could not find 'Zabbix servers' group.")
+        return []
+
+    monkeypatch.setattr(rollup_ingest, "ROLLUPS", {"suricata_alerts": (AlertHourly, rows)})
+    rollup_ingest.ingest_rollups(NOW)
+
+    rolled_from, rolled_until = get_rollup_state()["suricata_alerts"]
+    assert rolled_until == rolled_from + timedelta(hours=6)  # Only the first chunk counts as rolled up
+    assert len(calls) == 2
+
+    rollup_ingest.ingest_rollups(NOW)
+    assert calls[2] == rolled_until  # Retried from the failed chunk
+
+
+def test_alerts_of_every_severity_are_rolled_up(upstreams, monkeypatch):
+    def by_severity(window):
+        hit = window.edges[0].isoformat()
+        return {
+            severity: [("ET Sig", "9", 1, hit, [(1, hit)] + [(0, "")] * (len(window.labels) - 1))]
+            for severity in (1, 4)
+        }
+
+    monkeypatch.setattr(rollup_ingest, "query_suricata_alerts_by_severity", by_severity)
+    monkeypatch.setattr(rollup_ingest, "ROLLUPS", {"suricata_alerts": (AlertHourly, rollup_ingest._alert_rows)})
+    rollup_ingest.ingest_rollups(NOW)
+
+    with SessionLocal() as db:
+        severities = {severity for (severity,) in db.query(AlertHourly.severity).distinct()}
+    assert severities == {1, 4}
+
+
+def test_hours_are_not_rolled_up_before_they_settle(upstreams):
+    rollup_ingest.ingest_rollups(datetime(2026, 10, 17, 12, 10))
+    _, rolled_until = get_rollup_state()["suricata_alerts"]
+    assert rolled_until == datetime(2026, 10, 17, 11)  # 11:00-12:00 is still inside the settle delay
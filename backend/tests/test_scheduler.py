@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+import report_periods
+import scheduleReportAPI
+from report_periods import PERIODS
+from scheduleReportAPI import scheduled_run_time
+
+
+@pytest.mark.parametrize("now, job_id, expected", [
+    # On time
+    (datetime(2026, 11, 1, 0, 0, 3), "daily_report", datetime(2026, 11, 1)),
+    # Caught up after a restart at 03:00: still the 00:00 run
+    (datetime(2026, 11, 1, 3, 0), "daily_report", datetime(2026, 11, 1)),
+    (datetime(2026, 11, 1, 3, 0), "weekly_report", datetime(2026, 11, 1)),
+    (datetime(2026, 11, 1, 3, 0), "monthly_report", datetime(2026, 11, 1)),
+    # Latest fire time before a later moment
+    (datetime(2026, 11, 4, 12, 0), "weekly_report", datetime(2026, 11, 1)),
+    (datetime(2026, 11, 30, 23, 59), "monthly_report", datetime(2026, 11, 1)),
+])
+def test_scheduled_run_time(now, job_id, expected):
+    assert scheduled_run_time(job_id, now) == expected
+
+
+def test_caught_up_run_reports_the_missed_period(monkeypatch):
+    restart = datetime(2026, 11, 1, 3, 0)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return restart
+
+    monkeypatch.setattr(report_periods, "datetime", FrozenDatetime)
+    window = PERIODS["daily"].window(end=scheduled_run_time("daily_report", restart))
+    assert (window.start, window.end) == (datetime(2026, 10, 31), datetime(2026, 11, 1))
+
+
+class FakeConnection:
+    def __init__(self, fail_unlock=False):
+        self.fail_unlock = fail_unlock
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append(str(statement))
+        if self.fail_unlock:
+            raise RuntimeError("server closed the connection")
+
+    def invalidate(self):
+        self.calls.append("invalidate")
+
+    def close(self):
+        self.calls.append("close")
+
+
+def test_lock_connection_is_unlocked_and_never_pooled():
+    connection = FakeConnection()
+    scheduleReportAPI._release_leader_connection(connection)
+    assert connection.calls == ["SELECT pg_advisory_unlock(:key)", "invalidate", "close"]
+
+
+def test_lock_connection_is_dropped_when_unlock_fails():
+    connection = FakeConnection(fail_unlock=True)
+    scheduleReportAPI._release_leader_connection(connection)
+    assert connection.calls[-2:] == ["invalidate", "close"]
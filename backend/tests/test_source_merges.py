@@ -0,0 +1,58 @@
+from reportSources.suricata_source import _merge_alerts
+import reportSources.zabbix_source as zabbix_source
+from reportSources.zabbix_source import _merge_cpu_usage, _merge_network_problems
+
+
+def test_merge_alerts_adds_counts_and_keeps_the_last_hit():
+    done = [("ET SCAN SSH Scan", "9", 3, "2026-10-17T03:00:00.000Z", [2, 1, 0])]
+    part = [
+        ("ET SCAN SSH Scan", "9", 2, "2026-10-17T09:00:00.000Z", [0, 0, 2]),
+        ("ET DROP Listed", "7", 1, "2026-10-17T08:30:00.000Z", [0, 0, 1]),
+    ]
+    merged = {alert[1]: alert for alert in _merge_alerts(done, part, 2)}
+    assert merged["9"] == ("ET SCAN SSH Scan", "9", 5, "2026-10-17T09:00:00.000Z", [2, 1, 2])
+    assert merged["7"] == ("ET DROP Listed", "7", 1, "2026-10-17T08:30:00.000Z", [0, 0, 1])
+
+
+def test_merge_alerts_does_not_modify_its_inputs():
+    done = [("A", "1", 1, "t1", [1, 0])]
+    _merge_alerts(done, [("A", "1", 1, "t2", [0, 1])], 1)
+    assert done == [("A", "1", 1, "t1", [1, 0])]
+
+
+def test_merge_cpu_usage_takes_each_slot_from_the_part_that_covers_it():
+    done = {"srv1": [10, 20, 0, 0], "srv2": [5, 0, 0, 0]}
+    part = {"srv1": [0, 0, 30, 0], "srv3": [0, 0, 70, 0]}
+    assert _merge_cpu_usage(done, part, 2) == {
+        "srv1": [10, 20, 30, 0],
+        "srv2": [5, 0, 0, 0],  # No samples in the new slot
+        "srv3": [0, 0, 70, 0],  # First seen in the new slot
+    }
+
+
+def test_merge_network_problems_sums_counts_and_keeps_the_latest_occurrence():
+    done = {
+        "issues": [
+            ["2026-10-17 03:10:00", "sw1", "Link down", 2, 1760645400, "FortiGate: Link down"],
+            ["2026-10-17 01:00:00", "sw2", "High CPU", 1, 1760637600, "FortiGate: High CPU"],
+        ],
+        "problem_history": {"Link down": [2, 0, 0], "High CPU": [1, 0, 0]},
+    }
+    part = {
+        "issues": [["2026-10-17 09:00:00", "sw1", "Link down", 1, 1760666400, "FortiGate: Link down"]],
+        "problem_history": {"Link down": [0, 0, 1]},
+    }
+    merged = _merge_network_problems(done, part, 2)
+    issues = {(row[1], row[5]): row for row in merged["issues"]}
+    assert issues[("sw1", "FortiGate: Link down")] == [
+        "2026-10-17 09:00:00", "sw1", "Link down", 3, 1760666400, "FortiGate: Link down",
+    ]
+    assert issues[("sw2", "FortiGate: High CPU")][3] == 1
+    assert merged["problem_history"] == {"Link down": [2, 0, 1], "High CPU": [1, 0, 0]}
+
+
+def test_problem_history_is_ordered_by_total_count(monkeypatch):
+    history = {"High CPU": [1, 0, 0], "Link down": [2, 0, 1], "Fan failure": [0, 1, 0]}
+    monkeypatch.setattr(zabbix_source, "collect_network_problems",
+                        lambda window: {"issues": [], "problem_history": history})
+    assert list(zabbix_source.get_problem_history(None)) == ["Link down", "Fan failure", "High CPU"]
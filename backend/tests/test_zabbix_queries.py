@@ -0,0 +1,37 @@
+import pytest
+
+import zabbix_queries
+
+
+@pytest.fixture
+def zabbix(monkeypatch):
+    """Answer zabbix_request from a {method: [response, ...]} script."""
+    responses = {}
+
+    def request(method, params):
+        return responses[method].pop(0)
+
+    monkeypatch.setattr(zabbix_queries, "zabbix_request", request)
+    zabbix_queries.invalidate_metadata()
+    return responses
+
+
+def test_group_lookup_error_raises_instead_of_looking_empty(zabbix):
+    zabbix["hostgroup.get"] = [{"error": {"message": "Session terminated"}}]
+    with pytest.raises(RuntimeError):
+        zabbix_queries.get_group_id("Zabbix servers")
+
+
+def test_unknown_group_is_none(zabbix):
+    zabbix["hostgroup.get"] = [{"result": []}]
+    assert zabbix_queries.get_group_id("Zabbix servers") is None
+
+
+def test_failed_trend_batch_raises_instead_of_leaving_a_hole(zabbix, monkeypatch):
+    monkeypatch.setattr(zabbix_queries, "ZABBIX_HISTORY_BATCH_ITEMS", 1)
+    zabbix["trend.get"] = [
+        {"result": [{"itemid": "1", "clock": "3600", "value_min": "1", "value_avg": "2", "value_max": "3"}]},
+        {"error": {"message": "Query timeout"}},
+    ]
+    with pytest.raises(RuntimeError):
+        zabbix_queries.fetch_cpu_trends(["1", "2"], 0, 7200)
@@ -16,6 +16,7 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token", auto_error=False)
 
 class Token(BaseModel):
     access_token: str
@@ -56,3 +57,12 @@ def read_users_me(token: str = Depends(oauth2_scheme)):
         return {"username": username}
     except JWTError:
         raise HTTPException(status_code=403, detail="Invalid token")
+
+def get_optional_username(token: str | None = Depends(optional_oauth2_scheme)):
+    """Username from a valid bearer token, or None (routes that also work anonymously)."""
+    if not token:
+        return None
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
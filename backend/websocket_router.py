@@ -1,24 +1,82 @@
 from fastapi import WebSocket, APIRouter
-from typing import List
+from typing import Dict
+import asyncio
+import os
+
+# Messages waiting per connection before the slow-consumer policy applies
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "100"))
+# "drop_oldest": discard the oldest queued message; "disconnect": close the slow connection
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "drop_oldest")
+# A send taking longer than this (seconds) counts as a dead connection
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+
+
+class _Connection:
+    """One client: its bounded outbound queue and the task draining it."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+        self.sender = None
+
 
 # WebSocket Manager to manage active connections
 class WebSocketManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Dict[WebSocket, _Connection] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        connection = _Connection(websocket)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        self.active_connections[websocket] = connection
         print("WebSocket connection established")
 
     async def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        connection = self.active_connections.pop(websocket, None)
+        if connection is None:
+            return  # Already removed (e.g. dropped as a slow consumer)
+        if connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
         print("WebSocket connection closed")
 
+    async def _send_loop(self, connection: _Connection):
+        """Deliver queued messages to one client; a stalled client only delays itself."""
+        try:
+            while True:
+                message = await connection.queue.get()
+                await asyncio.wait_for(connection.websocket.send_text(message), WS_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"WebSocket send failed, dropping connection: {e}")
+            await self._close(connection)
+
+    async def _close(self, connection: _Connection, code: int = 1011):
+        await self.disconnect(connection.websocket)
+        try:
+            await connection.websocket.close(code=code)
+        except Exception:
+            pass  # Already closed by the client
+
+    def broadcast(self, message: str):
+        """Queue a message for every connected client without waiting on any socket.
+
+        Must be called from the event loop thread.
+        """
+        for connection in list(self.active_connections.values()):
+            if connection.queue.full():
+                if WS_SLOW_CONSUMER_POLICY == "disconnect":
+                    print("WebSocket client too slow, disconnecting")
+                    # 1013 = try again later; the client reconnects and starts fresh
+                    asyncio.create_task(self._close(connection, code=1013))
+                    continue
+                connection.queue.get_nowait()  # drop_oldest
+            connection.queue.put_nowait(message)
+
     async def send_notification(self, message: str):
         """Send notifications to all connected clients."""
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        self.broadcast(message)
 
 # Initialize the WebSocketManager instance
 ws_manager = WebSocketManager()
@@ -0,0 +1,78 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+from pathlib import Path
+
+# Assuming your .env is in the project root
+dotenv_path = Path(__file__).resolve().parent / '.env'
+load_dotenv(dotenv_path)
+
+ZABBIX_SERVER = os.getenv("ZABBIX_SERVER")
+ZABBIX_API_TOKEN = os.getenv("ZABBIX_API_TOKEN")
+ZABBIX_API_URL = f"{ZABBIX_SERVER}/api_jsonrpc.php"
+
+# Connection pool and retry settings (override in .env)
+ZABBIX_POOL_SIZE = int(os.getenv("ZABBIX_POOL_SIZE", "10"))
+ZABBIX_CONNECT_TIMEOUT = float(os.getenv("ZABBIX_CONNECT_TIMEOUT", "5"))
+ZABBIX_READ_TIMEOUT = float(os.getenv("ZABBIX_READ_TIMEOUT", "60"))
+ZABBIX_RETRIES = int(os.getenv("ZABBIX_RETRIES", "3"))
+ZABBIX_BACKOFF = float(os.getenv("ZABBIX_BACKOFF", "0.5"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _create_session():
+    """Build a keep-alive session with a connection pool and retry/backoff."""
+    retry = Retry(
+        total=ZABBIX_RETRIES,
+        connect=ZABBIX_RETRIES,
+        read=ZABBIX_RETRIES,
+        backoff_factor=ZABBIX_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),  # JSON-RPC *.get calls are safe to repeat
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=ZABBIX_POOL_SIZE,
+        pool_maxsize=ZABBIX_POOL_SIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {ZABBIX_API_TOKEN}"
+    })
+    return session
+
+
+def get_session():
+    """Return the shared Zabbix session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def zabbix_request(method, params):
+    """Call a Zabbix JSON-RPC method and return the decoded response body."""
+    payload = {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": params,
+        "id": 1
+    }
+    response = get_session().post(
+        ZABBIX_API_URL,
+        json=payload,
+        timeout=(ZABBIX_CONNECT_TIMEOUT, ZABBIX_READ_TIMEOUT)
+    )
+    return response.json()
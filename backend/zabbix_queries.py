@@ -0,0 +1,269 @@
+import os
+import threading
+import time
+from collections import defaultdict
+
+from zabbix_client import zabbix_request
+
+CPU_ITEM_KEY = "system.cpu.util"
+
+# How long host groups, hosts and CPU itemids stay cached (seconds, override in .env)
+ZABBIX_METADATA_TTL = float(os.getenv("ZABBIX_METADATA_TTL", "900"))
+
+# Maximum number of items per history.get call (keeps each response a sane size)
+ZABBIX_HISTORY_BATCH_ITEMS = int(os.getenv("ZABBIX_HISTORY_BATCH_ITEMS", "50"))
+
+
+def _chunks(values, size):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class MetadataCache:
+    """Thread-safe TTL cache for Zabbix metadata that rarely changes."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_metadata_cache = MetadataCache(ZABBIX_METADATA_TTL)
+
+
+def invalidate_metadata():
+    """Drop every cached host group, host list and CPU itemid."""
+    _metadata_cache.invalidate()
+    print("Zabbix metadata cache invalidated")
+
+
+def get_group_id(group_name):
+    """Return the groupid of a host group by name (cached), None if there is no such group.
+
+    Zabbix API errors raise RuntimeError.
+    """
+    key = ("group", group_name)
+    group_id = _metadata_cache.get(key)
+    if group_id is not None:
+        return group_id
+
+    data = zabbix_request("hostgroup.get", {
+        "output": ["groupid"],
+        "filter": {"name": [group_name]}
+    })
+    if "error" in data:
+        # Raise rather than look like "no such group": empty results of closed windows are cached
+        raise RuntimeError(f"Zabbix hostgroup.get failed: {data['error']}")
+
+    groups = data.get("result", [])
+    if not groups:
+        return None
+
+    group_id = groups[0]["groupid"]
+    _metadata_cache.set(key, group_id)
+    return group_id
+
+
+def get_group_hosts(group_id):
+    """Return {hostid: name} for every host in a group (cached)."""
+    key = ("hosts", group_id)
+    hosts = _metadata_cache.get(key)
+    if hosts is not None:
+        return hosts
+
+    data = zabbix_request("host.get", {
+        "output": ["hostid", "name"],
+        "groupids": [group_id]
+    })
+    if "error" in data:
+        raise RuntimeError(f"Zabbix host.get failed: {data['error']}")
+
+    hosts = {host["hostid"]: host["name"] for host in data.get("result", [])}
+    _metadata_cache.set(key, hosts)
+    return hosts
+
+
+def get_cpu_itemids(host_ids):
+    """Resolve the CPU utilization item of every host (cached per host).
+
+    Hosts not in the cache are resolved together with a single item.get.
+    Returns a dict of {hostid: itemid}; hosts without the item are left out.
+    """
+    host_items = {}
+    missing = []
+    for host_id in host_ids:
+        cached = _metadata_cache.get(("cpu_item", host_id))
+        if cached is None:
+            missing.append(host_id)
+        elif cached:
+            host_items[host_id] = cached
+
+    if not missing:
+        return host_items
+
+    data = zabbix_request("item.get", {
+        "output": ["itemid", "hostid", "key_"],
+        "hostids": missing,
+        "filter": {"key_": CPU_ITEM_KEY},
+        "sortfield": "name"
+    })
+
+    if "error" in data:
+        raise RuntimeError(f"Zabbix item.get failed: {data['error']}")
+
+    resolved = {}
+    for item in data.get("result", []):
+        resolved.setdefault(item["hostid"], item["itemid"])
+
+    for host_id in missing:
+        # An empty string remembers "no CPU item" so the host is not looked up again
+        _metadata_cache.set(("cpu_item", host_id), resolved.get(host_id, ""))
+    host_items.update(resolved)
+    return host_items
+
+
+def warm_up_metadata(group_names=("Discovered hosts", "Zabbix servers")):
+    """Pre-load group ids, host lists and CPU itemids so the first report skips those calls."""
+    try:
+        for group_name in group_names:
+            group_id = get_group_id(group_name)
+            if not group_id:
+                continue
+            hosts = get_group_hosts(group_id)
+            if hosts:
+                get_cpu_itemids(list(hosts.keys()))
+        print("Zabbix metadata cache warmed up")
+    except Exception as e:
+        print(f"Zabbix metadata warm-up failed: {e}")
+
+
+def fetch_cpu_history(item_ids, time_from, time_till=None):
+    """Fetch CPU history for many items at once, grouped by itemid.
+
+    Items are split into batches of ZABBIX_HISTORY_BATCH_ITEMS so a large host
+    group costs a few history.get calls instead of one per host.
+    """
+    history = defaultdict(list)
+
+    for batch in _chunks(list(item_ids), ZABBIX_HISTORY_BATCH_ITEMS):
+        params = {
+            "output": ["itemid", "clock", "value"],
+            "history": 0,  # Use history type 0 (float)
+            "itemids": batch,
+            "sortfield": "clock",
+            "sortorder": "ASC",
+            "time_from": time_from
+        }
+        if time_till is not None:
+            params["time_till"] = time_till
+
+        data = zabbix_request("history.get", params)
+        if "error" in data:
+            # A missing batch would leave holes in the series (and in cached results)
+            raise RuntimeError(f"Zabbix history.get failed: {data['error']}")
+
+        for entry in data.get("result", []):
+            history[entry["itemid"]].append(entry)
+
+    return dict(history)
+
+
+def fetch_cpu_trends(item_ids, time_from, time_till=None):
+    """Fetch hourly CPU trends (value_min/value_avg/value_max) grouped by itemid.
+
+    Trends hold one row per item per hour, so a week or a month of data for a
+    large host group is far cheaper than raw history.
+    """
+    trends = defaultdict(list)
+
+    for batch in _chunks(list(item_ids), ZABBIX_HISTORY_BATCH_ITEMS):
+        params = {
+            "output": ["itemid", "clock", "value_min", "value_avg", "value_max"],
+            "itemids": batch,
+            "time_from": time_from
+        }
+        if time_till is not None:
+            params["time_till"] = time_till
+
+        data = zabbix_request("trend.get", params)
+        if "error" in data:
+            raise RuntimeError(f"Zabbix trend.get failed: {data['error']}")
+
+        for entry in data.get("result", []):
+            trends[entry["itemid"]].append(entry)
+
+    # trend.get has no sortfield, so order each series by clock here
+    for rows in trends.values():
+        rows.sort(key=lambda entry: int(entry["clock"]))
+    return dict(trends)
+
+
+# Events per event.get page when walking a time range
+ZABBIX_EVENT_PAGE_SIZE = int(os.getenv("ZABBIX_EVENT_PAGE_SIZE", "1000"))
+
+
+def iter_events(params, page_size=None):
+    """Yield every event matching `params`, one event.get page at a time.
+
+    Pages are walked in ascending eventid order using eventid_from, so the
+    whole time range is returned no matter how many events it holds while
+    only one page is kept in memory.
+    """
+    page_size = page_size or ZABBIX_EVENT_PAGE_SIZE
+
+    page_params = dict(params)
+    page_params.pop("limit", None)
+    output = page_params.get("output")
+    if isinstance(output, list) and "eventid" not in output:
+        page_params["output"] = output + ["eventid"]
+    page_params.update({"sortfield": ["eventid"], "sortorder": "ASC", "limit": page_size})
+
+    while True:
+        data = zabbix_request("event.get", page_params)
+        if "error" in data:
+            raise RuntimeError(f"Zabbix event.get failed: {data['error']}")
+
+        page = data.get("result", [])
+        yield from page
+
+        if len(page) < page_size:
+            return
+        page_params["eventid_from"] = str(int(page[-1]["eventid"]) + 1)
+
+
+def newest_events(params, limit):
+    """The `limit` most recent events matching `params`, newest first (one event.get)."""
+    data = zabbix_request("event.get", dict(params, sortfield=["clock", "eventid"], sortorder="DESC", limit=limit))
+    if "error" in data:
+        raise RuntimeError(f"Zabbix event.get failed: {data['error']}")
+    return data.get("result", [])
+
+
+def count_problem_events(group_ids, time_from, time_till):
+    """Count trigger problem events in a window with countOutput (no event download)."""
+    data = zabbix_request("event.get", {
+        "countOutput": True,
+        "groupids": list(group_ids),
+        "source": 0,  # Triggers only
+        "value": 1,  # Problems only
+        "time_from": time_from,
+        "time_till": time_till
+    })
+    if "error" in data:
+        raise RuntimeError(f"Zabbix event.get count failed: {data['error']}")
+    return int(data.get("result", 0))
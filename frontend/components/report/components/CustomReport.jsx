@@ -8,13 +8,13 @@ import '@react-pdf-viewer/core/lib/styles/index.css';
 import '@react-pdf-viewer/default-layout/lib/styles/index.css';
 import '@react-pdf-viewer/toolbar/lib/styles/index.css';
 
+const PAGE_SIZE = 20; // Reports per page of the catalog listing
+
 export function CustomReport() {
   const [reportType, setReportType] = useState("Daily-Report");
-  const [generatedFiles, setGeneratedFiles] = useState({
-    daily: [],
-    weekly: [],
-    monthly: [],
-  });
+  const [generatedFiles, setGeneratedFiles] = useState([]); // Catalog entries of the current page
+  const [total, setTotal] = useState(0); // Matching reports over all pages
+  const [page, setPage] = useState(1);
   const [pdfUrl, setPdfUrl] = useState(""); // URL of the PDF to preview
   const [fileName, setFileName] = useState(""); // Track the file name being previewed
   const [isModalOpen, setIsModalOpen] = useState(false); // State to track if the modal is open
@@ -24,11 +24,27 @@ export function CustomReport() {
   const defaultLayoutPluginInstance = defaultLayoutPlugin();
   const toolbarPluginInstance = toolbarPlugin();
 
-  // Fetch generated files from the server
+  const fileType = reportType.toLowerCase().split('-')[0];
+
+  // Fetch one page of ready reports from the catalog; the search runs on the server
   const fetchGeneratedFiles = async () => {
     try {
-      const response = await axios.get(`${import.meta.env.VITE_API_URL}/custom/files`)
-      setGeneratedFiles(response.data);
+      const response = await axios.get(`${import.meta.env.VITE_API_URL}/reports`, {
+        params: {
+          source: "custom",
+          report_type: fileType,
+          status: "ready",
+          search: searchQuery || undefined,
+          page,
+          page_size: PAGE_SIZE,
+        },
+      });
+      if (response.data.items.length === 0 && page > 1) {
+        setPage(page - 1); // The last report of this page was deleted
+        return;
+      }
+      setGeneratedFiles(response.data.items);
+      setTotal(response.data.total);
     } catch (error) {
       console.error("Error fetching files:", error);
     }
@@ -36,11 +52,9 @@ export function CustomReport() {
 
   useEffect(() => {
     fetchGeneratedFiles();
-  }, []);
+  }, [reportType, searchQuery, page]);
 
-  // Filter files based on the selected report type and search query
-  const filteredFiles = generatedFiles[reportType.toLowerCase().split('-')[0]]
-    .filter((file) => file.toLowerCase().includes(searchQuery.toLowerCase()));
+  const pageCount = Math.max(1, Math.ceil(total / PAGE_SIZE));
 
   // Function to preview the file (PDF) in a modal
   const handlePreview = (fileType, fileName) => {
@@ -108,7 +122,7 @@ export function CustomReport() {
         <select
           className="select select-bordered w-full max-w-xs"
           value={reportType}
-          onChange={(e) => setReportType(e.target.value)}
+          onChange={(e) => { setReportType(e.target.value); setPage(1); }}
         >
           <option value="Daily-Report">Daily Report</option>
           <option value="Weekly-Report">Weekly Report</option>
@@ -121,13 +135,13 @@ export function CustomReport() {
           placeholder="Search by file name..."
           className="input input-bordered w-full max-w-xs"
           value={searchQuery}
-          onChange={(e) => setSearchQuery(e.target.value)}
+          onChange={(e) => { setSearchQuery(e.target.value); setPage(1); }}
         />
       </div>
 
       {/* Render the table with files */}
       <div className="flex-grow overflow-y-auto">
-        {filteredFiles.length > 0 ? (
+        {generatedFiles.length > 0 ? (
           <table className="table table-zebra w-full">
             <thead>
               <tr>
@@ -137,27 +151,27 @@ export function CustomReport() {
               </tr>
             </thead>
             <tbody>
-              {filteredFiles.map((file, index) => (
-                <tr key={index}>
-                  <td>{file}</td>
-                  <td>{new Date().toLocaleDateString()}</td>
+              {generatedFiles.map((file) => (
+                <tr key={file.id}>
+                  <td>{file.file_name}</td>
+                  <td>{new Date(file.created_at).toLocaleDateString()}</td>
                   <td>
                     <button
                       className="btn btn-sm btn-info mr-2"
-                      onClick={() => handlePreview(reportType.toLowerCase().split('-')[0], file)} // Preview
+                      onClick={() => handlePreview(fileType, file.file_name)} // Preview
                     >
                       Preview
                     </button>
                     <button
                       className="btn btn-sm btn-success mr-2"
-                      onClick={() => handleDownload(reportType.toLowerCase().split('-')[0], file)} // Download
+                      onClick={() => handleDownload(fileType, file.file_name)} // Download
                     >
                       Download
                     </button>
 
                     <button
                       className="btn btn-sm btn-secondary mr-2"
-                      onClick={() => handleDelete(reportType.toLowerCase().split('-')[0], file)} // Delete
+                      onClick={() => handleDelete(fileType, file.file_name)} // Delete
                     >
                       Delete
                     </button>
@@ -171,6 +185,19 @@ export function CustomReport() {
         )}
       </div>
 
+      {/* Pagination */}
+      {pageCount > 1 && (
+        <div className="flex justify-center items-center mt-4 space-x-4">
+          <button className="btn btn-sm" disabled={page <= 1} onClick={() => setPage(page - 1)}>
+            Previous
+          </button>
+          <span>Page {page} of {pageCount}</span>
+          <button className="btn btn-sm" disabled={page >= pageCount} onClick={() => setPage(page + 1)}>
+            Next
+          </button>
+        </div>
+      )}
+
       {/* Modal to display PDF preview */}
       {isModalOpen && (
         <div className="fixed inset-0 bg-black bg-opacity-50 flex justify-center items-center z-50">
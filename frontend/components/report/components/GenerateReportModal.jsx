@@ -2,8 +2,31 @@ import { useState } from "react";
 import axios from "axios";
 import Swal from "sweetalert2";
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
+// Poll /report/jobs/{id} (the report's catalog entry) until it is ready or failed, showing progress in the spinner
+async function waitForReportJob(jobId) {
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    const { data: job } = await axios.get(`${import.meta.env.VITE_API_URL}/report/jobs/${jobId}`);
+
+    if (job.status === "ready") {
+      return job;
+    }
+    if (job.status === "failed") {
+      throw new Error(job.error || "Report generation failed");
+    }
+
+    const container = Swal.getHtmlContainer();
+    if (container) {
+      container.textContent = `${job.stage} (${job.progress}%)`;
+    }
+  }
+}
+
 export function GenerateReportModal({ setIsGenerateModalOpen }) {
   const [reportType, setReportType] = useState("Daily-Report");
+  const [chartBackend, setChartBackend] = useState("raster");
 
   // Handle the report generation
   const handleGenerateReport = async (e) => {
@@ -49,14 +72,25 @@ export function GenerateReportModal({ setIsGenerateModalOpen }) {
         }
 
   
-        // Send Axios request to generate the report
+        // Queue the report; the backend answers right away with a job ID
+        const token = localStorage.getItem("token");
         const response = await axios.post(apiUrl, {
           date: todayDate,  // Send today's date as the date (in GMT+7 timezone)
+          chart_backend: chartBackend,  // "raster" (PNG charts) or "vector" (smaller PDF)
+        }, {
+          // Lets the report catalog record who generated the report
+          headers: token ? { Authorization: `Bearer ${token}` } : {},
         });
+        if (response.data.error) {
+          throw new Error(response.data.error);
+        }
+
+        // Poll the job until the report is built
+        const job = await waitForReportJob(response.data.job_id);
   
         // Close the loading spinner and show success message
         Swal.close();  // Close the loading spinner
-        const successResult = await Swal.fire("Success!", `${response.data.message}`, "success");
+        const successResult = await Swal.fire("Success!", `${job.message}`, "success");
   
         if (successResult.isConfirmed) {
           // Refresh the page only after the user clicks "OK"
@@ -89,6 +123,16 @@ export function GenerateReportModal({ setIsGenerateModalOpen }) {
           <option value="Monthly-Report">Monthly Report</option>
         </select>
 
+        {/* Dropdown to select chart style */}
+        <select
+          className="select select-bordered w-full mb-4"
+          value={chartBackend}
+          onChange={(e) => setChartBackend(e.target.value)}
+        >
+          <option value="raster">Image Charts</option>
+          <option value="vector">Vector Charts (smaller PDF)</option>
+        </select>
+
         <div className="flex justify-end space-x-4">
           {/* Close Button */}
           <button
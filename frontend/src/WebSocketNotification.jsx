@@ -61,7 +61,8 @@ const WebSocketNotification = () => {
         <div className="fixed top-4 right-4 z-50 animate-slide-in">
           <div className="alert alert-info shadow-lg w-full max-w-xs">
             <div>
-              <span>{message}</span>
+              {/* Batched notifications arrive as one frame, one message per line */}
+              <span className="whitespace-pre-line">{message}</span>
             </div>
           </div>
         </div>